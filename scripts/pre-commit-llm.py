@@ -9,14 +9,26 @@ Checks include:
 - Auto-generate .llm/skills/index.md from SKILL.md metadata and headings.
 - Validate docs and mkdocs consistency checks.
 - Reject stale release-specific wording for unstable rustdoc removals.
-- Advisory: warn about absolute guarantee language in Rust doc comments.
+- Advisory: warn about absolute guarantee language in Rust doc comments
+  (staged `src/` files only; run by hand with `--full` to scan every Rust
+  source, since neither CI nor the pre-commit config passes it).
 """
 
+import functools
+import os
 import subprocess
 import sys
 import re
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
 
 MAX_LINES = 500
 MAX_SKILL_NAME_LENGTH = 64
@@ -34,6 +46,166 @@ GITHUB_GUIDANCE_FILES = (
     Path(".llm/skills/github-operations/SKILL.md"),
 )
 
+# Regexes are compiled once at import time; the validators below run them in
+# per-file and per-line loops.
+_PEP585_ANNOTATION_RE = re.compile(r"\b(?:->|:)\s*(?:list|tuple|dict|set)\[")
+_PEP604_ANNOTATION_RE = re.compile(
+    r"\b(?:->|:)\s*[^#\n=]+?\|\s*(?:None|[A-Za-z_][A-Za-z0-9_]*)"
+)
+_GITHUB_TOOL_RES = (
+    re.compile(r"VS Code GitHub\s+connector/extension", re.IGNORECASE),
+    re.compile(r"local\s+`git`", re.IGNORECASE),
+    re.compile(r"GitHub CLI\s+\(`gh`\)", re.IGNORECASE),
+)
+_NEXT_SECTION_HEADING_RE = re.compile(r"\n#{1,2} ")
+_CARGO_VERSION_RE = re.compile(r'^version\s*=\s*"([^"]+)"\s*$')
+_USE_WHEN_RE = re.compile(r"\buse when\b", re.IGNORECASE)
+
+# Version-sync patterns. Every pattern captures the version in group
+# `_VERSION_GROUP`, so the table below is independent of the crate version.
+# Captures exclude newlines so an unbalanced quote cannot make a pattern scan
+# (and backtrack over) the rest of the file; plain `python3` may predate
+# atomic groups, so the classes are bounded instead.
+_VERSION_GROUP = 2
+_DEP_STRING_VERSION_RE = re.compile(r'(signal-fish-client\s*=\s*")([^"\n]+)(")')
+_DEP_TABLE_VERSION_RE = re.compile(
+    r'(signal-fish-client\s*=\s*\{[^}\n]*?\bversion\s*=\s*")([^"\n]+)(")'
+)
+_SDK_VERSION_RUST_RE = re.compile(
+    r'(sdk_version:\s*Some\(")([^"\n]+)("\.into\(\)\),)'
+)
+_SDK_VERSION_JSON_RE = re.compile(r'("sdk_version"\s*:\s*")([^"\n]+)(")')
+_CONTEXT_VERSION_RE = re.compile(r"(- \*\*Version:\*\*\s*)([^\s]+)")
+_TOML_VERSION_LINE_RE = re.compile(
+    r'(^version\s*=\s*")([^"\n]+)(")', flags=re.MULTILINE
+)
+# (repo-relative path, patterns applied in order) for every synced file.
+_VERSION_REPLACEMENTS = (
+    (Path("README.md"), (_DEP_STRING_VERSION_RE, _DEP_TABLE_VERSION_RE)),
+    (
+        Path("docs/getting-started.md"),
+        (_DEP_STRING_VERSION_RE, _DEP_TABLE_VERSION_RE),
+    ),
+    (Path("docs/index.md"), (_DEP_TABLE_VERSION_RE,)),
+    (Path("docs/wasm.md"), (_DEP_TABLE_VERSION_RE,)),
+    (Path("docs/examples.md"), (_DEP_TABLE_VERSION_RE,)),
+    (Path("docs/client.md"), (_SDK_VERSION_RUST_RE,)),
+    (Path("docs/protocol.md"), (_SDK_VERSION_JSON_RE,)),
+    (Path(".llm/context.md"), (_CONTEXT_VERSION_RE,)),
+    (Path(".llm/skills/crate-publishing/SKILL.md"), (_TOML_VERSION_LINE_RE,)),
+)
+
+_FENCE_MARKERS = ("```", "~~~")
+_YAML_STEP_KEYS = frozenset(("uses", "with", "run"))
+# Any ```yaml / ~~~yml fence opener; files without one skip the line walk.
+_YAML_FENCE_HINT_RE = re.compile(r"(?:```|~~~)[^\S\n]*ya?ml", re.IGNORECASE)
+# mkdocs.yml `nav:` line, and the first line after it that ends the section
+# (anything not indented and not a comment).
+_MKDOCS_NAV_START_RE = re.compile(r"^[ \t]*nav:[ \t]*$", re.MULTILINE)
+_MKDOCS_SECTION_END_RE = re.compile(r"^[^ #\r\n]", re.MULTILINE)
+# Markdown blocks seen by extract_title_and_paragraph(), matched at a line start:
+# a fenced code block (closed only by its own marker, or running to the end),
+# a blank or heading line, or a run of paragraph lines. Each alternative is
+# decided by the line's first non-blank characters, so matching never
+# backtracks across blocks. Each repetition consumes exactly one line and the
+# trailing parts are optional, so a failed repetition never forces a retry:
+# the scan stays linear even on unclosed fences and runaway paragraphs, which
+# is the guarantee an RE2-style DFA engine would add (and RE2 cannot express
+# the same-marker backreference anyway).
+_INLINE_WS = r"[^\S\n]*"
+_MARKDOWN_BLOCK_RE = re.compile(
+    r"(?P<fence>" + _INLINE_WS + r"(?P<mark>```|~~~)[^\n]*"
+    r"(?:\n(?!" + _INLINE_WS + r"(?P=mark))[^\n]*)*"
+    r"(?:\n" + _INLINE_WS + r"(?P=mark)[^\n]*)?\n?)"
+    r"|(?P<skip>" + _INLINE_WS + r"(?:#[^\n]*)?(?:\n|\Z))"
+    r"|(?P<paragraph>[^\n]*"
+    r"(?:\n(?!" + _INLINE_WS + r"(?:[#\n]|```|~~~|\Z))[^\n]*)*)"
+)
+# Every line boundary str.splitlines() recognizes other than a bare `\n`;
+# the block scan only understands `\n`, so these are rewritten to it first.
+_NON_LF_LINE_BREAK_RE = re.compile(r"\r\n?|[\x0b\x0c\x1c-\x1e\x85\u2028\u2029]")
+_LINE_BREAK_RE = re.compile(r"\r\n?|[\n\x0b\x0c\x1c-\x1e\x85\u2028\u2029]")
+# A line break inside a paragraph plus the whitespace around it; joining the
+# stripped lines with single spaces is one substitution over the block. Other
+# line boundaries are rewritten to `\n` before blocks are matched.
+_PARAGRAPH_LINE_BREAK_RE = re.compile(_INLINE_WS + r"\n" + _INLINE_WS)
+# The target capture stops at a newline so an unclosed `(` cannot make it
+# scan the rest of the file.
+_NAV_CARD_RE = re.compile(r"\[:octicons-arrow-right-24:\s+(.+?)\]\(([^)\n]+\.md)\)")
+
+# Surrounding whitespace is part of the pattern so lines need no strip().
+_LINK_REF_RE = re.compile(r"^\s*\[([^\]]+)\]:\s*(\S+)\s*$")
+_SEMVER_LABEL_RE = re.compile(r"^\d+\.\d+\.\d+$")
+_UNRELEASED_COMPARE_RE = re.compile(r"/compare/v(\d+\.\d+\.\d+)\.\.\.HEAD(?:[#?].*)?$")
+_RELEASE_TAG_RE = re.compile(r"/releases/tag/v(\d+\.\d+\.\d+)(?:[#?].*)?$")
+_RELEASE_COMPARE_RE = re.compile(
+    r"/compare/v(\d+\.\d+\.\d+)\.\.\.v(\d+\.\d+\.\d+)(?:[#?].*)?$"
+)
+
+# Matches a line containing both a guarantee word and a delivery/event term,
+# in either order, with one anchored match instead of two searches.
+_GUARANTEE_WORDS = ("always", "never", "guaranteed", "unconditional")
+_GUARANTEE_AND_DELIVERY_RE = re.compile(
+    r"^(?=.*?\b(?:always|never|guaranteed|unconditional(?:ly)?)\b)"
+    r"(?=.*?\b(?:deliver(?:y|ed|s)?|event|message|dispatch(?:ed|es)?|"
+    r"emit(?:ted|s)?|send|sent|receive[ds]?|notify|notif(?:ied|ication))\b)",
+    re.IGNORECASE,
+)
+
+
+# Decoded file contents keyed by absolute path, tagged with (mtime_ns, size).
+_TEXT_CACHE: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+
+def read_text_cached(path: Path) -> str:
+    """Read ``path`` as UTF-8, reusing the previous decode while it is unchanged.
+
+    Several checks scan the same markdown files during one hook run. Entries
+    are revalidated with a ``stat`` so files rewritten mid-run (version sync,
+    index generation) are read again. Raises ``OSError`` like ``read_text``.
+    """
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _TEXT_CACHE.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    text = path.read_text(encoding="utf-8")
+    _TEXT_CACHE[key] = (signature, text)
+    return text
+
+
+# ``splitlines()`` results keyed like _TEXT_CACHE, tied to the exact text object.
+_LINES_CACHE: Dict[str, Tuple[str, List[str]]] = {}
+
+
+def read_lines_cached(path: Path) -> List[str]:
+    """Return ``read_text_cached(path).splitlines()``, splitting each text once.
+
+    The list is shared between callers and must not be mutated.
+    """
+    text = read_text_cached(path)
+    key = os.path.abspath(path)
+    cached = _LINES_CACHE.get(key)
+    if cached is not None and cached[0] is text:
+        return cached[1]
+    lines = text.splitlines()
+    _LINES_CACHE[key] = (text, lines)
+    return lines
+
+
+def write_text_uncached(path: Path, text: str) -> None:
+    """Write ``text`` to ``path`` as UTF-8 and drop any cached copy of it.
+
+    The ``stat`` check in ``read_text_cached`` misses a same-size rewrite
+    within the filesystem's timestamp granularity, so every write the hook
+    makes goes through here. Raises ``OSError`` like ``write_text``.
+    """
+    key = os.path.abspath(path)
+    _TEXT_CACHE.pop(key, None)
+    _LINES_CACHE.pop(key, None)
+    path.write_text(text, encoding="utf-8")
+
 
 def path_for_bash(path: Path, cwd: Optional[Path] = None) -> str:
     """Return a Bash-safe path, preferring cwd-relative POSIX syntax."""
@@ -45,6 +217,19 @@ def path_for_bash(path: Path, cwd: Optional[Path] = None) -> str:
     return str(path).replace("\\", "/")
 
 
+def repo_relative(path: Path) -> str:
+    """Return ``path`` relative to REPO_ROOT for messages, else as given.
+
+    Uses string prefix slicing (``abspath`` is pure string work) rather than
+    ``resolve()``/``relative_to``, since it runs for every reported path.
+    """
+    absolute = os.path.abspath(path)
+    prefix = os.path.join(os.fspath(REPO_ROOT), "")
+    if absolute.startswith(prefix):
+        return absolute[len(prefix):]
+    return os.fspath(path)
+
+
 def validate_plain_python_annotation_syntax() -> List[str]:
     """Reject annotations that make plain `python3` entrypoints too new."""
     errors = []
@@ -53,14 +238,8 @@ def validate_plain_python_annotation_syntax() -> List[str]:
         REPO_ROOT / "scripts" / "check-admonitions.py",
     ]
     forbidden = [
-        (
-            re.compile(r"\b(?:->|:)\s*(?:list|tuple|dict|set)\["),
-            "PEP 585 built-in generic annotation",
-        ),
-        (
-            re.compile(r"\b(?:->|:)\s*[^#\n=]+?\|\s*(?:None|[A-Za-z_][A-Za-z0-9_]*)"),
-            "PEP 604 union annotation",
-        ),
+        (_PEP585_ANNOTATION_RE, "PEP 585 built-in generic annotation"),
+        (_PEP604_ANNOTATION_RE, "PEP 604 union annotation"),
     ]
 
     for path in checked:
@@ -84,16 +263,11 @@ def validate_plain_python_annotation_syntax() -> List[str]:
 def validate_github_tool_order(repo_root: Path = REPO_ROOT) -> List[str]:
     """Enforce connector, git, then gh ordering in every LLM entry point."""
     errors = []
-    patterns = (
-        re.compile(r"VS Code GitHub\s+connector/extension", re.IGNORECASE),
-        re.compile(r"local\s+`git`", re.IGNORECASE),
-        re.compile(r"GitHub CLI\s+\(`gh`\)", re.IGNORECASE),
-    )
 
     for relative_path in GITHUB_GUIDANCE_FILES:
         path = repo_root / relative_path
         try:
-            text = path.read_text(encoding="utf-8")
+            text = read_text_cached(path)
         except OSError as e:
             errors.append(f"  {relative_path.as_posix()}: could not read: {e}")
             continue
@@ -111,11 +285,11 @@ def validate_github_tool_order(repo_root: Path = REPO_ROOT) -> List[str]:
             continue
 
         section = text[marker_index + len(marker):]
-        next_heading = re.search(r"\n#{1,2} ", section)
+        next_heading = _NEXT_SECTION_HEADING_RE.search(section)
         if next_heading is not None:
             section = section[:next_heading.start()]
 
-        matches = [pattern.search(section) for pattern in patterns]
+        matches = [pattern.search(section) for pattern in _GITHUB_TOOL_RES]
         missing = [
             label
             for label, match in zip(("connector/extension", "local git", "gh"), matches)
@@ -157,6 +331,20 @@ def read_cargo_package_version() -> str:
     except OSError as e:
         raise RuntimeError(f"Could not read {cargo_toml}: {e}") from e
 
+    if tomllib is not None:
+        try:
+            data = tomllib.loads(content)
+        except tomllib.TOMLDecodeError as e:
+            raise RuntimeError(f"Could not parse {cargo_toml}: {e}") from e
+        # Either level may be a non-table value in a malformed manifest.
+        workspace = data.get("workspace")
+        package = workspace.get("package") if isinstance(workspace, dict) else None
+        version = package.get("version") if isinstance(package, dict) else None
+        if isinstance(version, str) and version:
+            return version
+        raise RuntimeError("Cargo.toml [workspace.package].version is missing or invalid.")
+
+    # Dependency-free fallback for interpreters without tomllib/tomli.
     in_package_section = False
     for line in content.splitlines():
         stripped = line.strip()
@@ -168,93 +356,36 @@ def read_cargo_package_version() -> str:
         if not in_package_section:
             continue
 
-        match = re.match(r'^version\s*=\s*"([^"]+)"\s*$', stripped)
+        match = _CARGO_VERSION_RE.match(stripped)
         if match:
             return match.group(1)
 
     raise RuntimeError("Cargo.toml [workspace.package].version is missing or invalid.")
 
 
+def _version_substitution(crate_version: str) -> Callable[["re.Match[str]"], str]:
+    """Return a ``re.sub`` callback that swaps the version group for ``crate_version``."""
+
+    def substitute(match: "re.Match[str]") -> str:
+        whole = match.group(0)
+        offset = match.start()
+        return (
+            whole[:match.start(_VERSION_GROUP) - offset]
+            + crate_version
+            + whole[match.end(_VERSION_GROUP) - offset:]
+        )
+
+    return substitute
+
+
 def sync_crate_version_references(crate_version: str) -> Tuple[List[str], List[Path]]:
     """Sync selected docs/context references to the canonical crate version."""
     errors = []
     changed_files = []
-    replacements = {
-        REPO_ROOT / "README.md": [
-            (
-                re.compile(r'(signal-fish-client\s*=\s*")([^"]+)(")'),
-                rf"\g<1>{crate_version}\g<3>",
-            ),
-            (
-                re.compile(
-                    r'(signal-fish-client\s*=\s*\{[^}\n]*\bversion\s*=\s*")([^"]+)(")'
-                ),
-                rf"\g<1>{crate_version}\g<3>",
-            ),
-        ],
-        REPO_ROOT / "docs" / "getting-started.md": [
-            (
-                re.compile(r'(signal-fish-client\s*=\s*")([^"]+)(")'),
-                rf"\g<1>{crate_version}\g<3>",
-            ),
-            (
-                re.compile(
-                    r'(signal-fish-client\s*=\s*\{[^}\n]*\bversion\s*=\s*")([^"]+)(")'
-                ),
-                rf"\g<1>{crate_version}\g<3>",
-            ),
-        ],
-        REPO_ROOT / "docs" / "index.md": [
-            (
-                re.compile(
-                    r'(signal-fish-client\s*=\s*\{[^}\n]*\bversion\s*=\s*")([^"]+)(")'
-                ),
-                rf"\g<1>{crate_version}\g<3>",
-            )
-        ],
-        REPO_ROOT / "docs" / "wasm.md": [
-            (
-                re.compile(
-                    r'(signal-fish-client\s*=\s*\{[^}\n]*\bversion\s*=\s*")([^"]+)(")'
-                ),
-                rf"\g<1>{crate_version}\g<3>",
-            )
-        ],
-        REPO_ROOT / "docs" / "examples.md": [
-            (
-                re.compile(
-                    r'(signal-fish-client\s*=\s*\{[^}\n]*\bversion\s*=\s*")([^"]+)(")'
-                ),
-                rf"\g<1>{crate_version}\g<3>",
-            )
-        ],
-        REPO_ROOT / "docs" / "client.md": [
-            (
-                re.compile(r'(sdk_version:\s*Some\(")([^"]+)("\.into\(\)\),)'),
-                rf"\g<1>{crate_version}\g<3>",
-            )
-        ],
-        REPO_ROOT / "docs" / "protocol.md": [
-            (
-                re.compile(r'("sdk_version"\s*:\s*")([^"]+)(")'),
-                rf"\g<1>{crate_version}\g<3>",
-            )
-        ],
-        REPO_ROOT / ".llm" / "context.md": [
-            (
-                re.compile(r"(- \*\*Version:\*\*\s*)([^\s]+)"),
-                rf"\g<1>{crate_version}",
-            )
-        ],
-        REPO_ROOT / ".llm" / "skills" / "crate-publishing" / "SKILL.md": [
-            (
-                re.compile(r'(^version\s*=\s*")([^"]+)(")', flags=re.MULTILINE),
-                rf"\g<1>{crate_version}\g<3>",
-            )
-        ],
-    }
+    substitute = _version_substitution(crate_version)
 
-    for path, path_replacements in replacements.items():
+    for relative_path, patterns in _VERSION_REPLACEMENTS:
+        path = REPO_ROOT / relative_path
         if not path.exists():
             continue
         try:
@@ -264,12 +395,12 @@ def sync_crate_version_references(crate_version: str) -> Tuple[List[str], List[P
             continue
 
         updated = original
-        for pattern, replacement in path_replacements:
-            updated = pattern.sub(replacement, updated)
+        for pattern in patterns:
+            updated = pattern.sub(substitute, updated)
 
         if updated != original:
             try:
-                path.write_text(updated, encoding="utf-8")
+                write_text_uncached(path, updated)
             except OSError as e:
                 errors.append(f"  Could not write {path}: {e}")
                 continue
@@ -278,9 +409,39 @@ def sync_crate_version_references(crate_version: str) -> Tuple[List[str], List[P
     return errors, changed_files
 
 
-def find_md_files(directory: Path) -> List[Path]:
+def find_files_with_suffix(directory: Path, suffix: str) -> Iterator[Path]:
+    """Recursively yield files ending in ``suffix``, in directory order.
+
+    Walks with ``os.scandir`` so file types come from the cached directory
+    entries instead of one ``stat`` per path. Symlinks are not followed and
+    unreadable or missing directories are skipped. Callers that report
+    results sort them once themselves.
+    """
+    stack = [os.fspath(directory)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(suffix) and entry.is_file(follow_symlinks=False):
+                    yield Path(entry.path)
+
+
+def find_md_files(directory: Path) -> Iterator[Path]:
     """Recursively find all .md files under a directory."""
-    return sorted(directory.rglob("*.md"))
+    return find_files_with_suffix(directory, ".md")
+
+
+def count_lines(text: str) -> int:
+    """Count lines like ``len(text.splitlines())`` for LF/CRLF text, without a list."""
+    count = text.count("\n")
+    if text and not text.endswith("\n"):
+        count += 1
+    return count
 
 
 def check_line_counts(md_files: List[Path]) -> List[str]:
@@ -288,10 +449,9 @@ def check_line_counts(md_files: List[Path]) -> List[str]:
     errors = []
     for path in md_files:
         try:
-            lines = path.read_text(encoding="utf-8").splitlines()
-            count = len(lines)
+            count = count_lines(read_text_cached(path))
             if count > MAX_LINES:
-                rel = path.relative_to(REPO_ROOT)
+                rel = repo_relative(path)
                 errors.append(
                     f"  {rel}: {count} lines (limit is {MAX_LINES})"
                 )
@@ -304,29 +464,61 @@ def discover_skill_files(skills_dir: Path) -> List[Path]:
     """Return standard one-directory-deep ``<name>/SKILL.md`` files."""
     if not skills_dir.is_dir():
         return []
-    return sorted(path for path in skills_dir.glob("*/SKILL.md") if path.is_file())
+    skill_files = []
+    with os.scandir(skills_dir) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                path = Path(entry.path, "SKILL.md")
+                if path.is_file():
+                    skill_files.append(path)
+    return sorted(skill_files)
 
 
-def parse_skill_frontmatter(text: str) -> Tuple[dict, List[str]]:
+def parse_skill_frontmatter(text: str) -> Tuple[Dict[str, str], List[str]]:
     """Parse the simple top-level YAML scalars used by project skills.
 
     Agent Skills permits general YAML. Project metadata intentionally uses only
     one-line string values so the pre-commit hook remains dependency-free.
+    Skill validation and index generation parse the same SKILL.md text, so the
+    parse is memoized; each caller gets its own dict and list.
     """
+    metadata, errors = _parse_skill_frontmatter_cached(text)
+    return dict(metadata), list(errors)
+
+
+def _frontmatter_closing_index(lines: List[str]) -> Optional[int]:
+    """Return the index of the closing ``---`` line after the opening one."""
+    for index in range(1, len(lines)):
+        if lines[index].strip() == "---":
+            return index
+    return None
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_skill_frontmatter_cached(
+    text: str,
+) -> Tuple[Tuple[Tuple[str, str], ...], Tuple[str, ...]]:
+    """Memoized core of ``parse_skill_frontmatter`` with immutable results."""
     errors = []
-    lines = text.splitlines()
+    # Split only through the first later line containing `---`, which is
+    # normally the closing delimiter, instead of the whole document. Cutting
+    # just after any splitlines() boundary yields the same leading lines as a
+    # full split.
+    marker = text.find("---", 3)
+    head_break = _LINE_BREAK_RE.search(text, marker) if marker != -1 else None
+    head_end = head_break.end() if head_break is not None else -1
+    lines = text[:head_end].splitlines() if head_end != -1 else text.splitlines()
     if not lines or lines[0].strip() != "---":
-        return {}, ["frontmatter must start on the first line with `---`"]
+        return (), ("frontmatter must start on the first line with `---`",)
 
-    try:
-        closing = next(
-            index for index, line in enumerate(lines[1:], start=1)
-            if line.strip() == "---"
-        )
-    except StopIteration:
-        return {}, ["frontmatter is missing its closing `---` delimiter"]
+    closing = _frontmatter_closing_index(lines)
+    if closing is None and head_end != -1:
+        lines = text.splitlines()
+        closing = _frontmatter_closing_index(lines)
+    if closing is None:
+        return (), ("frontmatter is missing its closing `---` delimiter",)
 
-    metadata = {}
+    metadata: Dict[str, str] = {}
     for line_number, line in enumerate(lines[1:closing], start=2):
         if not line.strip() or line.lstrip().startswith("#"):
             continue
@@ -350,7 +542,7 @@ def parse_skill_frontmatter(text: str) -> Tuple[dict, List[str]]:
             value = value[1:-1]
         metadata[key] = value
 
-    return metadata, errors
+    return tuple(metadata.items()), tuple(errors)
 
 
 def validate_skill_files(skill_files: List[Path]) -> List[str]:
@@ -358,7 +550,7 @@ def validate_skill_files(skill_files: List[Path]) -> List[str]:
     errors = []
     for path in skill_files:
         try:
-            text = path.read_text(encoding="utf-8")
+            text = read_text_cached(path)
         except OSError as e:
             errors.append(f"  {path}: could not read: {e}")
             continue
@@ -392,7 +584,7 @@ def validate_skill_files(skill_files: List[Path]) -> List[str]:
                 errors.append(
                     f"  {prefix}: `description` exceeds {MAX_SKILL_DESCRIPTION_LENGTH} characters"
                 )
-            if not re.search(r"\buse when\b", description, flags=re.IGNORECASE):
+            if not _USE_WHEN_RE.search(description):
                 errors.append(
                     f"  {prefix}: `description` must state activation context with `Use when`"
                 )
@@ -405,15 +597,23 @@ def validate_skill_layout(skills_dir: Path, skill_files: List[Path]) -> List[str
     if not skills_dir.is_dir():
         return []
 
+    flat_guides = []
+    directories = []
+    with os.scandir(skills_dir) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                directories.append(Path(entry.path))
+            elif entry.name.endswith(".md") and entry.name != "index.md":
+                flat_guides.append(Path(entry.path))
+
     errors = []
-    for path in sorted(skills_dir.glob("*.md")):
-        if path.name != "index.md":
-            errors.append(
-                f"  {path_for_bash(path, REPO_ROOT)}: legacy flat skill; move it to `<name>/SKILL.md`"
-            )
+    for path in sorted(flat_guides):
+        errors.append(
+            f"  {path_for_bash(path, REPO_ROOT)}: legacy flat skill; move it to `<name>/SKILL.md`"
+        )
 
     discovered_dirs = {path.parent for path in skill_files}
-    for path in sorted(item for item in skills_dir.iterdir() if item.is_dir()):
+    for path in sorted(directories):
         if path not in discovered_dirs:
             errors.append(
                 f"  {path_for_bash(path, REPO_ROOT)}: skill directory is missing `SKILL.md`"
@@ -421,27 +621,99 @@ def validate_skill_layout(skills_dir: Path, skill_files: List[Path]) -> List[str
     return errors
 
 
+def iter_markdown_lines(
+    lines: Iterable[str],
+) -> Iterator[Tuple[str, int, str, str]]:
+    """Yield ``(kind, line_number, line, stripped)`` for each markdown line.
+
+    This is the single fenced-code-block state machine shared by the markdown
+    scanners. ``kind`` is one of:
+
+    - ``"fence_open"``: a ``` or ~~~ marker opening a code block.
+    - ``"fence_close"``: the matching marker closing the current block.
+    - ``"code"``: a line inside a block, including markers of the other fence
+      character (backtick and tilde fences never close each other).
+    - ``"text"``: any line outside a code block.
+
+    An unclosed fence turns every remaining line into ``"code"``. ``lines``
+    are split without terminators, as ``read_lines_cached`` returns them.
+    """
+    fence_markers = _FENCE_MARKERS
+    fence_char = None
+    for line_number, line in enumerate(lines, start=1):
+        stripped = line.strip()
+        marker = stripped[:3]
+        if marker in fence_markers:
+            char = marker[0]
+            if fence_char is None:
+                fence_char = char
+                yield "fence_open", line_number, line, stripped
+            elif char == fence_char:
+                fence_char = None
+                yield "fence_close", line_number, line, stripped
+            else:
+                yield "code", line_number, line, stripped
+        elif fence_char is None:
+            yield "text", line_number, line, stripped
+        else:
+            yield "code", line_number, line, stripped
+
+
+@functools.lru_cache(maxsize=512)
+def extract_title_and_paragraph(text: str) -> Tuple[str, str]:
+    """Extract the first H1 heading and the first paragraph in one pass.
+
+    Headings inside fenced code blocks (``` or ~~~) are ignored, and fenced
+    code never counts as paragraph content. Backtick fences and tilde fences
+    are tracked independently per CommonMark. The text is consumed block by
+    block with ``_MARKDOWN_BLOCK_RE`` rather than line by line, and the scan
+    stops once both parts are found. Lines are split where ``str.splitlines``
+    splits them, so CR-only and Unicode line separators count as breaks. The
+    title is ``"(Untitled)"`` and the paragraph ``""`` when missing.
+
+    Results are memoized by text; ``read_text_cached`` hands out the same
+    string object for an unchanged file, so its hash is computed only once.
+    """
+    text = _NON_LF_LINE_BREAK_RE.sub("\n", text)
+    title = None
+    paragraph = None
+    match_block = _MARKDOWN_BLOCK_RE.match
+    pos = 0
+    end = len(text)
+    while pos < end and (title is None or paragraph is None):
+        block = match_block(text, pos)
+        kind = block.lastgroup
+        if kind == "skip":
+            # A heading's `#` is the block's first non-blank character, so
+            # plain string checks find an H1 without stripping blank blocks.
+            hash_pos = text.find("#", pos, block.end()) if title is None else -1
+            if hash_pos != -1 and text.startswith("# ", hash_pos):
+                title = text[hash_pos + 2:block.end()].strip() or None
+        elif kind == "paragraph" and paragraph is None:
+            paragraph = _PARAGRAPH_LINE_BREAK_RE.sub(
+                " ", block.group("paragraph")
+            ).strip()
+        pos = block.end()
+    return (
+        "(Untitled)" if title is None else title,
+        "" if paragraph is None else paragraph,
+    )
+
+
 def extract_title(text: str) -> str:
     """Extract the first H1 heading from markdown text.
 
     Headings inside fenced code blocks (``` or ~~~) are ignored.
     """
-    fence_char = None
-    for line in text.splitlines():
-        stripped = line.strip()
-        if stripped.startswith("```") or stripped.startswith("~~~"):
-            char = stripped[0]
-            if fence_char is not None:
-                if char == fence_char:
-                    fence_char = None
-                continue
-            fence_char = char
-            continue
-        if fence_char is not None:
-            continue
-        if stripped.startswith("# "):
-            return stripped[2:].strip()
-    return "(Untitled)"
+    # Fast path: an H1 on the first line cannot be inside a fence.
+    if text.startswith("# "):
+        end = text.find("\n")
+        line = text[2:end if end != -1 else len(text)]
+        # The first `\n` may lie past a CR-only or Unicode line break.
+        title = line.splitlines()[0].strip() if line else ""
+        if title:
+            return title
+    return extract_title_and_paragraph(text)[0]
 
 
 def extract_first_paragraph(text: str) -> str:
@@ -449,43 +721,8 @@ def extract_first_paragraph(text: str) -> str:
 
     Fenced code blocks (``` ... ``` and ~~~ ... ~~~) are properly skipped
     so that lines inside a code fence are never treated as paragraph content.
-    Backtick fences and tilde fences are tracked independently per CommonMark.
     """
-    lines = text.splitlines()
-    in_paragraph = False
-    fence_char = None
-    paragraph_lines = []
-
-    for line in lines:
-        stripped = line.strip()
-        # Toggle code-fence state on opening/closing markers
-        if stripped.startswith("```") or stripped.startswith("~~~"):
-            char = stripped[0]
-            if fence_char is not None:
-                if char == fence_char:
-                    fence_char = None
-                continue
-            fence_char = char
-            if in_paragraph:
-                break
-            continue
-        # While inside a code fence, skip all lines
-        if fence_char is not None:
-            continue
-        # Skip headings
-        if stripped.startswith("#"):
-            if in_paragraph:
-                break
-            continue
-        # Blank line ends a paragraph
-        if not stripped:
-            if in_paragraph:
-                break
-            continue
-        in_paragraph = True
-        paragraph_lines.append(stripped)
-
-    return " ".join(paragraph_lines).strip()
+    return extract_title_and_paragraph(text)[1]
 
 
 def generate_index(skill_files: List[Path]) -> str:
@@ -506,7 +743,7 @@ def generate_index(skill_files: List[Path]) -> str:
     for path in skill_files:
         rel = path.relative_to(SKILLS_DIR)
         try:
-            text = path.read_text(encoding="utf-8")
+            text = read_text_cached(path)
         except OSError:
             continue
 
@@ -539,17 +776,30 @@ def generate_index(skill_files: List[Path]) -> str:
     return "\n".join(lines)
 
 
-def git_add(path: Path) -> None:
-    """Stage a file with git add."""
-    rel = str(path.relative_to(REPO_ROOT))
+def _file_has_text(path: Path, text: str) -> bool:
+    """Return True when ``path`` exists and already holds exactly ``text``."""
+    try:
+        return read_text_cached(path) == text
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def git_add(paths: List[Path]) -> None:
+    """Stage files with a single git add invocation."""
+    if not paths:
+        return
+    rels = [str(path.relative_to(REPO_ROOT)) for path in paths]
     result = subprocess.run(
-        ["git", "add", rel],
+        ["git", "add", "--", *rels],
         cwd=str(REPO_ROOT),
         capture_output=True,
         text=True,
     )
     if result.returncode != 0:
-        print(f"Warning: could not stage {rel}: {result.stderr.strip()}", file=sys.stderr)
+        print(
+            f"Warning: could not stage {', '.join(rels)}: {result.stderr.strip()}",
+            file=sys.stderr,
+        )
 
 
 def validate_mkdocs_nav() -> List[str]:
@@ -571,22 +821,19 @@ def validate_mkdocs_nav() -> List[str]:
     except OSError as e:
         errors.append(f"  Could not read {mkdocs_yml}: {e}")
         return errors
-    in_nav = False
-
-    for line_num, line in enumerate(content.splitlines(), start=1):
-        trimmed = line.strip()
-
-        # Detect the start of the nav section
-        if trimmed == "nav:":
-            in_nav = True
-            continue
 
-        # Detect exit from nav section (top-level key)
-        if in_nav and line and not line.startswith(" ") and not line.startswith("#"):
-            break
+    # Slice out the nav section instead of walking the whole config.
+    nav = _MKDOCS_NAV_START_RE.search(content)
+    if nav is None:
+        return errors
+    end = _MKDOCS_SECTION_END_RE.search(content, nav.end())
+    nav_block = content[nav.end():end.start() if end else len(content)]
+    # The block starts right after `nav:`, so its first (empty) line is the
+    # `nav:` line itself.
+    nav_line_num = content.count("\n", 0, nav.start()) + 1
 
-        if not in_nav:
-            continue
+    for line_num, line in enumerate(nav_block.splitlines(), start=nav_line_num):
+        trimmed = line.strip()
 
         # Nav entries look like: `  - Label: filename.md`
         # or bare entries: `  - filename.md`
@@ -629,65 +876,62 @@ def validate_yaml_step_indentation(md_files: List[Path]) -> List[str]:
 
     for path in md_files:
         try:
-            content = path.read_text(encoding="utf-8")
+            if not _YAML_FENCE_HINT_RE.search(read_text_cached(path)):
+                continue
+            lines = read_lines_cached(path)
         except OSError as e:
             errors.append(f"  Could not read {path}: {e}")
             continue
 
         in_yaml_fence = False
-        fence_char = None
         expected_step_key_indent = None
         step_item_indent = None
 
-        for line_num, line in enumerate(content.splitlines(), start=1):
-            stripped = line.strip()
-
-            if stripped.startswith("```") or stripped.startswith("~~~"):
-                char = stripped[0]
-                if fence_char is not None:
-                    if char == fence_char:
-                        fence_char = None
-                        in_yaml_fence = False
-                        expected_step_key_indent = None
-                        step_item_indent = None
-                    continue
-
-                fence_char = char
-                fence_lang = stripped[3:].strip().lower()
-                in_yaml_fence = fence_lang in {"yaml", "yml"}
+        for kind, line_num, line, stripped in iter_markdown_lines(lines):
+            if kind == "fence_open" or kind == "fence_close":
+                in_yaml_fence = (
+                    kind == "fence_open"
+                    and stripped[3:].strip().lower() in {"yaml", "yml"}
+                )
                 expected_step_key_indent = None
                 step_item_indent = None
                 continue
 
-            if fence_char is None or not in_yaml_fence:
+            if kind != "code" or not in_yaml_fence:
                 continue
 
-            step_name_match = re.match(r"^(\s*)-\s+name\s*:", line)
-            if step_name_match:
-                step_item_indent = len(step_name_match.group(1))
-                expected_step_key_indent = step_item_indent + 2
-                continue
+            # Lex the line once: leading indent, then prefix checks on the rest.
+            rest = line.lstrip()
+            indent = len(line) - len(rest)
 
-            # Keep alignment context only when a sibling top-level step item starts.
-            # Nested list items under `with`/other mappings must not reset alignment.
-            step_item_match = re.match(r"^(\s*)-\s+", line)
-            if step_item_match and step_item_indent is not None:
-                item_indent = len(step_item_match.group(1))
-                if item_indent == step_item_indent:
+            if rest[:1] == "-" and rest[1:2].isspace():
+                item = rest[1:].lstrip()
+                if item.startswith("name") and item[4:].lstrip().startswith(":"):
+                    step_item_indent = indent
                     expected_step_key_indent = step_item_indent + 2
-                continue
+                    continue
+
+                # Keep alignment context only when a sibling top-level step item
+                # starts. Nested list items under `with`/other mappings must not
+                # reset alignment.
+                if step_item_indent is not None:
+                    if indent == step_item_indent:
+                        expected_step_key_indent = step_item_indent + 2
+                    continue
 
-            step_key_match = re.match(r"^(\s*)(uses|with|run)\s*:", line)
-            if step_key_match and expected_step_key_indent is not None:
-                actual_indent = len(step_key_match.group(1))
-                key_name = step_key_match.group(2)
+            if expected_step_key_indent is None:
+                continue
+            key_name, colon, _ = rest.partition(":")
+            key_name = key_name.rstrip()
+            if colon and key_name in _YAML_STEP_KEYS:
+                actual_indent = indent
                 if actual_indent != expected_step_key_indent:
                     direction = (
                         "over-indented"
                         if actual_indent > expected_step_key_indent
                         else "under-indented"
                     )
-                    rel = path.relative_to(REPO_ROOT)
+                    rel = repo_relative(path)
                     errors.append(
                         f"  {rel}:{line_num} malformed fenced YAML step: "
                         f"`{key_name}:` is {direction} (got {actual_indent}, "
@@ -715,26 +959,29 @@ def validate_doc_nav_card_consistency() -> List[str]:
         errors.append(f"  Could not read {index_path}: {e}")
         return errors
 
-    card_pattern = re.compile(
-        r"\[:octicons-arrow-right-24:\s+(.+?)\]\(([^)]+\.md)\)"
-    )
-
-    for match in card_pattern.finditer(content):
-        label = match.group(1)
-        filename = match.group(2)
-
-        # Skip external URLs
-        if filename.startswith("http"):
-            continue
+    # Skip external URLs
+    cards = [
+        (match.group(1), match.group(2))
+        for match in _NAV_CARD_RE.finditer(content)
+        if not match.group(2).startswith("http")
+    ]
 
-        target_path = docs_dir / filename
+    # Card grids can link the same page more than once; read and parse each
+    # target page once.
+    h1_by_file = {}
+    read_errors = {}
+    for filename in dict.fromkeys(filename for _, filename in cards):
         try:
-            target_content = target_path.read_text(encoding="utf-8")
+            h1_by_file[filename] = extract_title(read_text_cached(docs_dir / filename))
         except OSError as e:
-            errors.append(f"  Could not read docs/{filename}: {e}")
+            read_errors[filename] = e
+
+    for label, filename in cards:
+        if filename in read_errors:
+            errors.append(f"  Could not read docs/{filename}: {read_errors[filename]}")
             continue
 
-        h1 = extract_title(target_content)
+        h1 = h1_by_file[filename]
         if h1 == "(Untitled)":
             errors.append(
                 f"  docs/{filename} has no H1 heading. "
@@ -763,45 +1010,46 @@ def validate_changelog_example_links(md_files: List[Path]) -> List[str]:
          - `/compare/vPREV...vX.Y.Z`
     """
     errors = []
-    link_ref_re = re.compile(r"^\[([^\]]+)\]:\s*(\S+)\s*$")
-    semver_label_re = re.compile(r"^\d+\.\d+\.\d+$")
-    compare_re = re.compile(r"/compare/v(\d+\.\d+\.\d+)\.\.\.HEAD(?:[#?].*)?$")
-    release_tag_re = re.compile(r"/releases/tag/v(\d+\.\d+\.\d+)(?:[#?].*)?$")
-    release_compare_re = re.compile(
-        r"/compare/v(\d+\.\d+\.\d+)\.\.\.v(\d+\.\d+\.\d+)(?:[#?].*)?$"
-    )
 
     for path in md_files:
         try:
-            content = path.read_text(encoding="utf-8")
+            content = read_text_cached(path)
         except OSError as e:
             errors.append(f"  Could not read {path}: {e}")
             continue
 
-        refs = {}
-        for line in content.splitlines():
-            match = link_ref_re.match(line.strip())
-            if match:
-                refs[match.group(1)] = match.group(2)
-
-        if "Unreleased" not in refs:
+        # Only files defining an `[Unreleased]: ...` reference are checked.
+        if "[Unreleased]:" not in content:
             continue
 
-        version_labels = [label for label in refs if semver_label_re.match(label)]
-        if not version_labels:
+        # Track the [Unreleased] URL and the highest version link while
+        # scanning; a later definition of the same label replaces its URL,
+        # and the first label seen wins ties between equal versions.
+        unreleased_url = None
+        latest = None
+        latest_key = None
+        latest_url = ""
+        for line in read_lines_cached(path):
+            if "]:" not in line:
+                continue
+            match = _LINK_REF_RE.match(line)
+            if match is None:
+                continue
+            label, url = match.groups()
+            if label == "Unreleased":
+                unreleased_url = url
+            elif label == latest:
+                latest_url = url
+            elif _SEMVER_LABEL_RE.match(label):
+                key = tuple(int(part) for part in label.split("."))
+                if latest_key is None or key > latest_key:
+                    latest, latest_key, latest_url = label, key, url
+
+        if unreleased_url is None or latest is None:
             continue
 
-        latest = max(
-            version_labels,
-            key=lambda v: tuple(int(part) for part in v.split(".")),
-        )
-
-        unreleased_url = refs["Unreleased"]
-        compare_match = compare_re.search(unreleased_url)
-        try:
-            rel = path.resolve().relative_to(REPO_ROOT.resolve())
-        except ValueError:
-            rel = path
+        compare_match = _UNRELEASED_COMPARE_RE.search(unreleased_url)
+        rel = repo_relative(path)
         if compare_match is None:
             errors.append(
                 f"  {rel}: [Unreleased] link should use '/compare/v{latest}...HEAD'. "
@@ -814,15 +1062,8 @@ def validate_changelog_example_links(md_files: List[Path]) -> List[str]:
                 f"Expected compare/v{latest}...HEAD."
             )
 
-        latest_url = refs.get(latest)
-        if latest_url is None:
-            errors.append(
-                f"  {rel}: missing link reference for latest version [{latest}]."
-            )
-            continue
-
-        release_tag_match = release_tag_re.search(latest_url)
-        release_compare_match = release_compare_re.search(latest_url)
+        release_tag_match = _RELEASE_TAG_RE.search(latest_url)
+        release_compare_match = _RELEASE_COMPARE_RE.search(latest_url)
         if release_tag_match is None and release_compare_match is None:
             errors.append(
                 f"  {rel}: [{latest}] link should use either "
@@ -897,13 +1138,13 @@ def validate_unstable_feature_wording(md_files: List[Path]) -> List[str]:
 
     for path in md_files:
         try:
-            content = path.read_text(encoding="utf-8")
+            content = read_text_cached(path)
         except OSError as e:
             errors.append(f"  Could not read {path}: {e}")
             continue
 
         if "doc_auto_cfg" in content and "removed in Rust " in content:
-            rel = path.relative_to(REPO_ROOT)
+            rel = repo_relative(path)
             errors.append(
                 f"  {rel}: avoid release-specific wording ('removed in Rust ...') "
                 "for `doc_auto_cfg`. Use stable wording such as "
@@ -913,39 +1154,61 @@ def validate_unstable_feature_wording(md_files: List[Path]) -> List[str]:
     return errors
 
 
-def warn_absolute_guarantee_language() -> List[str]:
-    """Scan src/**/*.rs doc comments for absolute guarantee language.
+def staged_rust_sources() -> Optional[List[Path]]:
+    """Return staged added/modified ``src/**/*.rs`` files, or None if git fails."""
+    try:
+        result = subprocess.run(
+            [
+                "git", "diff", "--cached", "--name-only", "--diff-filter=ACMR",
+                "--", "src/*.rs",
+            ],
+            cwd=str(REPO_ROOT),
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    # git already lists paths in sorted order.
+    return [REPO_ROOT / line for line in result.stdout.splitlines() if line]
+
+
+def warn_absolute_guarantee_language(
+    rust_files: Optional[List[Path]] = None,
+) -> List[str]:
+    """Scan Rust doc comments for absolute guarantee language.
 
     Detects words like "always", "never", "guaranteed", "unconditional" when
     they appear alongside delivery/event-related terms in doc comments.
+    Scans ``rust_files`` when given (the hook passes the staged files),
+    otherwise every ``src/**/*.rs`` file.
     Returns a list of advisory warning strings (does not cause hook failure).
     """
     warnings = []
-    src_dir = REPO_ROOT / "src"
-    if not src_dir.is_dir():
-        return warnings
-
-    guarantee_re = re.compile(
-        r"\b(always|never|guaranteed|unconditional(?:ly)?)\b", re.IGNORECASE
-    )
-    delivery_re = re.compile(
-        r"\b(deliver(?:y|ed|s)?|event|message|dispatch(?:ed|es)?|"
-        r"emit(?:ted|s)?|send|sent|receive[ds]?|notify|notif(?:ied|ication))\b",
-        re.IGNORECASE,
-    )
+    if rust_files is None:
+        src_dir = REPO_ROOT / "src"
+        if not src_dir.is_dir():
+            return warnings
+        rust_files = sorted(find_files_with_suffix(src_dir, ".rs"))
 
-    for path in sorted(src_dir.rglob("*.rs")):
+    for path in rust_files:
         try:
-            lines = path.read_text(encoding="utf-8").splitlines()
+            text = path.read_text(encoding="utf-8")
         except OSError:
             continue
 
-        for line_num, line in enumerate(lines, start=1):
+        # Most files contain no guarantee word at all; skip the per-line scan.
+        lowered = text.lower()
+        if not any(word in lowered for word in _GUARANTEE_WORDS):
+            continue
+
+        for line_num, line in enumerate(text.splitlines(), start=1):
             stripped = line.strip()
-            if not (stripped.startswith("///") or stripped.startswith("//!")):
+            if not stripped.startswith(("///", "//!")):
                 continue
-            if guarantee_re.search(stripped) and delivery_re.search(stripped):
-                rel = path.relative_to(REPO_ROOT)
+            if _GUARANTEE_AND_DELIVERY_RE.match(stripped):
+                rel = repo_relative(path)
                 warnings.append(
                     f"  {rel}:{line_num}: {stripped.strip()}"
                 )
@@ -960,6 +1223,7 @@ def main() -> int:
 
     # 1. Sync selected version references from Cargo.toml (blocking on errors)
     version_sync_errors = []
+    paths_to_stage = []
     try:
         crate_version = read_cargo_package_version()
     except RuntimeError as e:
@@ -969,9 +1233,9 @@ def main() -> int:
     if crate_version is not None:
         sync_errors, changed_files = sync_crate_version_references(crate_version)
         version_sync_errors.extend(sync_errors)
+        paths_to_stage.extend(changed_files)
         for changed in changed_files:
-            git_add(changed)
-            rel = changed.relative_to(REPO_ROOT)
+            rel = repo_relative(changed)
             print(f"Synced crate version reference in {rel} -> {crate_version}")
 
     # 2. Discover and validate standard folder-based Agent Skills
@@ -979,8 +1243,8 @@ def main() -> int:
     skill_validation_errors = validate_skill_layout(SKILLS_DIR, skill_files)
     skill_validation_errors.extend(validate_skill_files(skill_files))
 
-    # 3. Collect all .md files under .llm/
-    all_md = find_md_files(LLM_DIR)
+    # 3. Collect all .md files under .llm/ (sorted once the index exists)
+    all_md = list(find_md_files(LLM_DIR))
     index_generation_errors = []
 
     # 4. Generate the index BEFORE line-count checks
@@ -988,89 +1252,100 @@ def main() -> int:
     if SKILLS_DIR.exists():
         index_content = generate_index(skill_files)
         try:
-            INDEX_FILE.write_text(index_content, encoding="utf-8")
+            # Most commits leave the index unchanged; skip rewriting it then
+            if not _file_has_text(INDEX_FILE, index_content):
+                write_text_uncached(INDEX_FILE, index_content)
         except OSError as e:
             index_generation_errors.append(
                 f"  Could not write {INDEX_FILE}: {e}"
             )
         else:
-            git_add(INDEX_FILE)
+            paths_to_stage.append(INDEX_FILE)
             print(
                 f"Generated .llm/skills/index.md "
-                f"({len(index_content.splitlines())} lines)"
+                f"({count_lines(index_content)} lines)"
             )
+            # A freshly created index is the only file the walk above missed
+            if INDEX_FILE not in all_md:
+                all_md.append(INDEX_FILE)
+    all_md.sort()
 
-    # Refresh the list after generating index
-    all_md = find_md_files(LLM_DIR)
+    # Stage every file rewritten above with one git process
+    git_add(paths_to_stage)
 
     # 5. Check line counts for all .md files under .llm/
     line_count_errors = check_line_counts(all_md)
 
-    # 6. Run devcontainer documentation validation (non-blocking)
+    # 6. Start devcontainer documentation validation (non-blocking); the
+    #    script runs alongside the in-process checks below
     validate_script = REPO_ROOT / "scripts" / "validate-devcontainer-docs.sh"
+    devcontainer_check = None
     if validate_script.exists():
-        result = subprocess.run(
+        devcontainer_check = subprocess.Popen(
             ["bash", path_for_bash(validate_script, REPO_ROOT)],
             cwd=str(REPO_ROOT),
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
         )
-        if result.returncode != 0:
-            print(
-                "\nWarning: devcontainer documentation validation failed:",
-                file=sys.stderr,
-            )
-            if result.stdout.strip():
-                for line in result.stdout.strip().splitlines():
-                    print(f"  {line}", file=sys.stderr)
-            if result.stderr.strip():
-                for line in result.stderr.strip().splitlines():
-                    print(f"  {line}", file=sys.stderr)
-        else:
-            if result.stdout.strip():
-                print(result.stdout.strip())
-
-    # 7. Validate mkdocs.yml nav references (blocking)
-    nav_errors = validate_mkdocs_nav()
-
-    # 8. Validate fenced YAML workflow step indentation in docs (blocking)
-    yaml_step_indentation_errors = validate_yaml_step_indentation(all_md)
-
-    # 9. Validate nav card labels match page titles (blocking)
-    nav_card_errors = validate_doc_nav_card_consistency()
-
-    # 10. Validate changelog-style reference links are version-consistent (blocking)
-    changelog_link_errors = validate_changelog_example_links(all_md)
-
-    # 11. Validate unstable feature wording in .llm markdown (blocking)
-    unstable_wording_errors = validate_unstable_feature_wording(all_md)
 
-    # 12. Validate required changelog Added entries for public APIs (blocking)
-    changelog_added_api_errors = validate_changelog_added_api_entries()
-
-    # 13. Validate GitHub tool preference in every LLM guidance entry point
-    github_tool_order_errors = validate_github_tool_order()
-
-    # 14. Validate Python syntax compatibility for plain `python3` entrypoints
-    python_syntax_errors = validate_plain_python_annotation_syntax()
+    try:
+        # 7. Validate mkdocs.yml nav references (blocking)
+        nav_errors = validate_mkdocs_nav()
+
+        # 8. Validate fenced YAML workflow step indentation in docs (blocking)
+        yaml_step_indentation_errors = validate_yaml_step_indentation(all_md)
+
+        # 9. Validate nav card labels match page titles (blocking)
+        nav_card_errors = validate_doc_nav_card_consistency()
+
+        # 10. Validate changelog-style reference links are version-consistent (blocking)
+        changelog_link_errors = validate_changelog_example_links(all_md)
+
+        # 11. Validate unstable feature wording in .llm markdown (blocking)
+        unstable_wording_errors = validate_unstable_feature_wording(all_md)
+
+        # 12. Validate required changelog Added entries for public APIs (blocking)
+        changelog_added_api_errors = validate_changelog_added_api_entries()
+
+        # 13. Validate GitHub tool preference in every LLM guidance entry point
+        github_tool_order_errors = validate_github_tool_order()
+
+        # 14. Validate Python syntax compatibility for plain `python3` entrypoints
+        python_syntax_errors = validate_plain_python_annotation_syntax()
+    except BaseException:
+        # Do not leave the background script orphaned with undrained pipes
+        if devcontainer_check is not None:
+            devcontainer_check.kill()
+            devcontainer_check.communicate()
+        raise
+
+    # Report the devcontainer documentation validation started in step 6
+    if devcontainer_check is not None:
+        stdout, stderr = devcontainer_check.communicate()
+        if devcontainer_check.returncode != 0:
+            report = ["\nWarning: devcontainer documentation validation failed:"]
+            for output in (stdout, stderr):
+                report.extend(f"  {line}" for line in output.strip().splitlines())
+            sys.stderr.write("\n".join(report) + "\n")
+        elif stdout.strip():
+            print(stdout.strip())
 
     # 15. Advisory: warn about absolute guarantee language in doc comments
-    guarantee_warnings = warn_absolute_guarantee_language()
+    #     of staged Rust files (`--full` rescans all of src/)
+    rust_files = None if "--full" in sys.argv[1:] else staged_rust_sources()
+    guarantee_warnings = warn_absolute_guarantee_language(rust_files)
     if guarantee_warnings:
-        print(
+        report = [
             "\nWarning: absolute guarantee language in doc comments "
             "(advisory only — not blocking):",
-            file=sys.stderr,
-        )
-        for w in guarantee_warnings:
-            print(w, file=sys.stderr)
-        print(
+            *guarantee_warnings,
             "\nPlease verify these guarantees are accurate. "
             "Words like 'always', 'never', 'guaranteed', and "
             "'unconditional' near delivery/event terms may "
             "over-promise to callers.",
-            file=sys.stderr,
-        )
+        ]
+        sys.stderr.write("\n".join(report) + "\n")
 
     # 16. Report all collected errors together
     error_sections = [
@@ -1136,26 +1411,25 @@ def main() -> int:
         ),
     ]
 
+    # Each report is assembled first and written with a single call.
     if any(errors for errors, _, _ in error_sections):
+        report = []
         for errors, title, guidance in error_sections:
             if not errors:
                 continue
-            print(f"\nPre-commit hook FAILED: {title}", file=sys.stderr)
-            for error in errors:
-                print(error, file=sys.stderr)
-            print(f"\n{guidance}", file=sys.stderr)
+            report.append(f"\nPre-commit hook FAILED: {title}")
+            report.extend(errors)
+            report.append(f"\n{guidance}")
+        sys.stderr.write("\n".join(report) + "\n")
         return 1
 
     # Report clean status
-    counts = []
+    report = [f"All .llm/ files are within the {MAX_LINES}-line limit:"]
     for path in all_md:
-        n = len(path.read_text(encoding="utf-8").splitlines())
-        rel = path.relative_to(REPO_ROOT)
-        counts.append(f"  {rel}: {n} lines")
-
-    print(f"All .llm/ files are within the {MAX_LINES}-line limit:")
-    for c in counts:
-        print(c)
+        n = count_lines(read_text_cached(path))
+        rel = repo_relative(path)
+        report.append(f"  {rel}: {n} lines")
+    sys.stdout.write("\n".join(report) + "\n")
 
     return 0
 
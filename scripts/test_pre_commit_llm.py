@@ -1,9 +1,16 @@
 """Tests for pre-commit-llm.py helper and validation functions."""
 
+import ast
+import bisect
+import functools
 import importlib.util
+import os
 import re
+import subprocess
 import sys
+import tokenize
 from pathlib import Path
+from typing import Dict, List, Optional
 from unittest.mock import patch
 
 import pytest
@@ -11,6 +18,8 @@ import pytest
 # ---------------------------------------------------------------------------
 # Import the module from the scripts directory using importlib so that we
 # don't need the scripts directory on PYTHONPATH or an __init__.py file.
+# The hyphenated script still goes through importlib's SourceFileLoader,
+# which reads and writes __pycache__/pre-commit-llm.*.pyc.
 # ---------------------------------------------------------------------------
 
 _SCRIPT_PATH = Path(__file__).resolve().parent / "pre-commit-llm.py"
@@ -32,6 +41,8 @@ read_cargo_package_version = _mod.read_cargo_package_version
 sync_crate_version_references = _mod.sync_crate_version_references
 warn_absolute_guarantee_language = _mod.warn_absolute_guarantee_language
 path_for_bash = _mod.path_for_bash
+read_text_cached = _mod.read_text_cached
+count_lines = _mod.count_lines
 validate_plain_python_annotation_syntax = _mod.validate_plain_python_annotation_syntax
 validate_github_tool_order = _mod.validate_github_tool_order
 
@@ -56,6 +67,69 @@ def test_path_for_bash_prefers_relative_posix_path():
     )
 
 
+def test_read_text_cached_reuses_unchanged_file(tmp_path):
+    """Repeated reads of an unchanged file decode it only once."""
+    doc = tmp_path / "doc.md"
+    doc.write_text("# Doc\n", encoding="utf-8")
+    original_read_text = Path.read_text
+    reads = []
+
+    def counting_read_text(self, *args, **kwargs):
+        reads.append(self)
+        return original_read_text(self, *args, **kwargs)
+
+    with patch.object(Path, "read_text", counting_read_text):
+        assert read_text_cached(doc) == "# Doc\n"
+        assert read_text_cached(doc) == "# Doc\n"
+
+    assert reads == [doc]
+
+
+def test_read_text_cached_rereads_rewritten_file(tmp_path):
+    """A file rewritten during the hook run is read again."""
+    doc = tmp_path / "doc.md"
+    doc.write_text("# Doc\n", encoding="utf-8")
+    assert read_text_cached(doc) == "# Doc\n"
+
+    doc.write_text("# Rewritten Doc\n", encoding="utf-8")
+
+    assert read_text_cached(doc) == "# Rewritten Doc\n"
+
+
+def test_read_text_cached_rereads_same_size_rewrite_by_hook(tmp_path):
+    """A hook write invalidates the cache even when size and mtime match."""
+    doc = tmp_path / "doc.md"
+    doc.write_text("# Doc A\n", encoding="utf-8")
+    assert read_text_cached(doc) == "# Doc A\n"
+    before = doc.stat()
+
+    _mod.write_text_uncached(doc, "# Doc B\n")
+    os.utime(doc, ns=(before.st_atime_ns, before.st_mtime_ns))
+
+    assert read_text_cached(doc) == "# Doc B\n"
+    assert _mod.read_lines_cached(doc) == ["# Doc B"]
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "one", "one\n", "one\ntwo", "one\ntwo\n", "\n\n", "one\r\ntwo\r\n"],
+)
+def test_count_lines_matches_splitlines(text):
+    """The list-free line counter agrees with splitlines() for LF/CRLF text."""
+    assert count_lines(text) == len(text.splitlines())
+
+
+def test_repo_relative_strips_repo_root(tmp_path, monkeypatch):
+    """Paths under REPO_ROOT are shown repo-relative; others are unchanged."""
+    monkeypatch.setattr(_mod, "REPO_ROOT", tmp_path)
+
+    assert _mod.repo_relative(tmp_path / ".llm" / "context.md") == str(
+        Path(".llm/context.md")
+    )
+    outside = tmp_path.parent / "elsewhere.md"
+    assert _mod.repo_relative(outside) == str(outside)
+
+
 def test_plain_python_entrypoints_avoid_modern_annotation_syntax():
     """Plain `python3` scripts should avoid syntax that narrows interpreter support."""
     assert validate_plain_python_annotation_syntax() == []
@@ -144,162 +218,244 @@ def test_github_tool_order_validator_rejects_gh_before_git(tmp_path):
     assert all("connector/extension -> local git -> gh order" in error for error in errors)
 
 
-# ===================================================================
-# Tests for extract_first_paragraph
-# ===================================================================
+def test_find_md_files_walks_nested_directories(tmp_path):
+    """The scandir walk finds nested markdown files in sorted order."""
+    (tmp_path / "skills" / "alpha").mkdir(parents=True)
+    (tmp_path / "skills" / "alpha" / "SKILL.md").write_text("# A\n", encoding="utf-8")
+    (tmp_path / "skills" / "index.md").write_text("# I\n", encoding="utf-8")
+    (tmp_path / "context.md").write_text("# C\n", encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("not markdown\n", encoding="utf-8")
 
+    assert sorted(_mod.find_md_files(tmp_path)) == [
+        tmp_path / "context.md",
+        tmp_path / "skills" / "alpha" / "SKILL.md",
+        tmp_path / "skills" / "index.md",
+    ]
 
-class TestExtractFirstParagraph:
-    """Tests for the extract_first_paragraph helper."""
 
-    def test_simple_paragraph_after_heading(self):
-        """A plain paragraph immediately following an H1 heading is returned."""
-        text = """\
-# My Heading
+def test_find_md_files_missing_directory_is_empty(tmp_path):
+    """A missing directory yields no files instead of raising."""
+    assert list(_mod.find_md_files(tmp_path / "missing")) == []
 
-This is the first paragraph."""
-        assert extract_first_paragraph(text) == "This is the first paragraph."
 
-    def test_paragraph_with_blank_lines_before_and_after(self):
-        """Leading and trailing blank lines around the paragraph are ignored."""
-        text = """\
-# Title
+# Numbered workflow comment in main(), e.g. "# 3. Discover markdown files".
+_STEP_RE = re.compile(r"#[ \t]+(\d+)\.[ \t]", re.ASCII)
 
 
-This is the paragraph.
+@functools.lru_cache(maxsize=1)
+def _parsed_script(mtime_ns: int) -> ast.Module:
+    """Parse pre-commit-llm.py once per on-disk revision (keyed by mtime)."""
+    return ast.parse(_SCRIPT_PATH.read_text(encoding="utf-8"))
 
 
-Some other text."""
-        assert extract_first_paragraph(text) == "This is the paragraph."
+def _script_tree() -> ast.Module:
+    return _parsed_script(_SCRIPT_PATH.stat().st_mtime_ns)
 
-    def test_code_fence_before_paragraph(self):
-        """A fenced code block before the real paragraph is skipped entirely."""
-        text = """\
-# Heading
 
-```
-code line one
-code line two
-```
+def test_regexes_are_compiled_at_module_scope():
+    """Functions use precompiled module-level patterns, never ``re.*`` helpers."""
+    tree = _script_tree()
+    calls = []
+    for function in ast.walk(tree):
+        if not isinstance(function, ast.FunctionDef):
+            continue
+        for node in ast.walk(function):
+            if (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and isinstance(node.func.value, ast.Name)
+                and node.func.value.id == "re"
+            ):
+                calls.append(f"{function.name}:{node.lineno}: re.{node.func.attr}")
 
-This is the actual paragraph."""
-        assert extract_first_paragraph(text) == "This is the actual paragraph."
+    assert calls == []
 
-    def test_code_fence_with_language_specifier(self):
-        """Code fences with language tags (```rust, ```toml) are recognized."""
-        text = """\
-# Heading
 
-```rust
-fn main() {}
-```
+def test_read_lines_cached_splits_each_text_once(tmp_path):
+    """Repeated reads share one line list until the file changes."""
+    doc = tmp_path / "doc.md"
+    doc.write_text("# Title\r\nBody\n", encoding="utf-8")
 
-Real paragraph here."""
-        assert extract_first_paragraph(text) == "Real paragraph here."
+    first = _mod.read_lines_cached(doc)
+    assert first == ["# Title", "Body"]
+    assert _mod.read_lines_cached(doc) is first
 
-    def test_code_fence_with_toml_specifier(self):
-        """Another language specifier variant (```toml) is handled."""
-        text = """\
-# Config
+    doc.write_text("# Changed title\n", encoding="utf-8")
+    assert _mod.read_lines_cached(doc) == ["# Changed title"]
 
-```toml
-[package]
-name = "example"
-```
 
-Description of the config."""
-        assert extract_first_paragraph(text) == "Description of the config."
+def test_parse_skill_frontmatter_results_are_independent_copies():
+    """Memoized frontmatter parses hand each caller a fresh dict and list."""
+    text = "---\nname: demo\ndescription: Use when testing.\nbad line\n---\n"
+    metadata, errors = _mod.parse_skill_frontmatter(text)
+    metadata["name"] = "changed"
+    errors.clear()
 
-    def test_multiple_code_fences_before_paragraph(self):
-        """Multiple code fences before the paragraph are all skipped."""
-        text = """\
-# Heading
+    again, again_errors = _mod.parse_skill_frontmatter(text)
+    assert again == {"name": "demo", "description": "Use when testing."}
+    assert again_errors == ["frontmatter line 4 must be a top-level `key: value` scalar"]
 
-```
-first block
-```
 
-```python
-second block
-```
+def test_parse_skill_frontmatter_finds_closing_after_dashes_in_values():
+    """A `---` inside a value does not end the frontmatter early."""
+    text = "---\nname: demo\ndescription: a---b. Use when testing.\n---\n\n# Demo\n"
+    metadata, errors = _mod.parse_skill_frontmatter(text)
+    assert metadata == {"name": "demo", "description": "a---b. Use when testing."}
+    assert errors == []
 
-The actual paragraph after two code blocks."""
-        assert (
-            extract_first_paragraph(text)
-            == "The actual paragraph after two code blocks."
-        )
 
-    def test_code_fence_immediately_after_heading_no_paragraph_before(self):
-        """When a code fence follows a heading with no paragraph in between,
-        the paragraph after the code fence is returned."""
-        text = """\
-# Heading
-```
-some code
-```
-Paragraph after code fence."""
-        assert extract_first_paragraph(text) == "Paragraph after code fence."
+@pytest.mark.parametrize(
+    "newline", ["\r", "\r\n", "\u2028"], ids=["cr", "crlf", "u2028"]
+)
+def test_parse_skill_frontmatter_splits_like_splitlines(newline):
+    """Frontmatter delimiters are found across every splitlines() boundary."""
+    text = newline.join(
+        ["---", "name: demo", "description: Use when testing.", "---", "", "# Demo", ""]
+    )
+    metadata, errors = _mod.parse_skill_frontmatter(text)
+    assert metadata == {"name": "demo", "description": "Use when testing."}
+    assert errors == []
 
-    def test_paragraph_followed_by_code_fence(self):
-        """A paragraph that precedes a code fence stops at the fence boundary."""
-        text = """\
-# Title
 
-First paragraph text.
+def test_iter_markdown_lines_classifies_fences():
+    """The shared fence walker labels markers, code, and text lines."""
+    lines = "# Title\n```yaml\n~~~\nkey: value\n```\nafter\n".splitlines()
 
-```
-code here
-```"""
-        assert extract_first_paragraph(text) == "First paragraph text."
+    kinds = [
+        (kind, line_number)
+        for kind, line_number, _, _ in _mod.iter_markdown_lines(lines)
+    ]
 
-    def test_paragraph_immediately_followed_by_code_fence(self):
-        """If a code fence opens right after paragraph lines (no blank line),
-        the paragraph ends and the fence content is excluded."""
-        text = """\
-# Title
+    assert kinds == [
+        ("text", 1),
+        ("fence_open", 2),
+        ("code", 3),
+        ("code", 4),
+        ("fence_close", 5),
+        ("text", 6),
+    ]
 
-Paragraph line.
-```
-code inside fence
-```"""
-        assert extract_first_paragraph(text) == "Paragraph line."
 
-    def test_empty_text_returns_empty_string(self):
-        """An empty input string returns an empty string."""
-        assert extract_first_paragraph("") == ""
+# ===================================================================
+# Tests for extract_first_paragraph
+# ===================================================================
 
-    def test_only_headings_returns_empty_string(self):
-        """Input consisting solely of headings returns an empty string."""
-        text = """\
-# Heading One
-## Heading Two
-### Heading Three"""
-        assert extract_first_paragraph(text) == ""
 
-    def test_only_code_fences_returns_empty_string(self):
-        """Input that contains only fenced code blocks returns an empty string."""
-        text = """\
-```
-line inside fence
-another line
-```"""
-        assert extract_first_paragraph(text) == ""
+# Heading, fenced code, then the paragraph expected from extract_first_paragraph.
+_FENCED_PARAGRAPH_TEMPLATE = "# Heading\n\n{fences}\n\n{paragraph}"
+
+
+# (id, text, expected) cases for extract_first_paragraph.
+_EXTRACT_CASES = (
+    (
+        "simple-paragraph-after-heading",
+        "# My Heading\n\nThis is the first paragraph.",
+        "This is the first paragraph.",
+    ),
+    (
+        "blank-lines-before-and-after",
+        "# Title\n\n\nThis is the paragraph.\n\n\nSome other text.",
+        "This is the paragraph.",
+    ),
+    (
+        "code-fence-before-paragraph",
+        "# Heading\n\n```\ncode line one\ncode line two\n```\n\n"
+        "This is the actual paragraph.",
+        "This is the actual paragraph.",
+    ),
+    (
+        "code-fence-immediately-after-heading",
+        "# Heading\n```\nsome code\n```\nParagraph after code fence.",
+        "Paragraph after code fence.",
+    ),
+    (
+        "paragraph-followed-by-code-fence",
+        "# Title\n\nFirst paragraph text.\n\n```\ncode here\n```",
+        "First paragraph text.",
+    ),
+    (
+        "paragraph-immediately-followed-by-code-fence",
+        "# Title\n\nParagraph line.\n```\ncode inside fence\n```",
+        "Paragraph line.",
+    ),
+    ("empty-text", "", ""),
+    ("only-headings", "# Heading One\n## Heading Two\n### Heading Three", ""),
+    ("only-code-fences", "```\nline inside fence\nanother line\n```", ""),
+    (
+        "multi-line-paragraph",
+        "# Heading\n\nFirst line of paragraph.\nSecond line of paragraph.\n"
+        "Third line of paragraph.\n\nAnother paragraph that should not appear.",
+        "First line of paragraph. Second line of paragraph. Third line of paragraph.",
+    ),
+    ("only-blank-lines", "\n\n   \n\n", ""),
+    (
+        "no-heading-just-paragraph",
+        "Just a paragraph with no heading.",
+        "Just a paragraph with no heading.",
+    ),
+    (
+        "heading-inside-code-fence-is-ignored",
+        "```\n# This is not a real heading\n```\n\nActual paragraph.",
+        "Actual paragraph.",
+    ),
+    (
+        "crlf-line-endings",
+        "# Title\r\n\r\n```\r\ncode\r\n```\r\n\r\nFirst line.\r\nSecond line.\r\n",
+        "First line. Second line.",
+    ),
+    (
+        "unclosed-code-fence-hides-remaining-text",
+        "# Title\n\n```bash\necho hi\n\nNot a paragraph.\n",
+        "",
+    ),
+    (
+        "whitespace-only-line-ends-paragraph",
+        "# Title\n  First line.\n \t \nSecond paragraph.\n",
+        "First line.",
+    ),
+    (
+        "nested-backticks-in-code-fence",
+        "# Title\n\n```\nsome `inline` code\n```\n\nThe paragraph.",
+        "The paragraph.",
+    ),
+    ("cr-only-line-breaks", "#\rPara\rmore", "Para more"),
+    ("file-separator-line-break", "#\x1cx", "x"),
+    (
+        "unicode-line-separators",
+        "# Title\u2028\u2028First\x85second\u2029\u2029Other.",
+        "First second",
+    ),
+)
 
-    def test_multi_line_paragraph(self):
-        """Consecutive non-blank, non-heading lines are joined into one paragraph."""
-        text = """\
-# Heading
 
-First line of paragraph.
-Second line of paragraph.
-Third line of paragraph.
+class TestExtractFirstParagraph:
+    """Tests for the extract_first_paragraph helper."""
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [(text, expected) for _, text, expected in _EXTRACT_CASES],
+        ids=[case_id for case_id, _, _ in _EXTRACT_CASES],
+    )
+    def test_extract_first_paragraph(self, text, expected):
+        """Headings, blank lines and fenced code are skipped; lines are joined."""
+        assert extract_first_paragraph(text) == expected
 
-Another paragraph that should not appear."""
-        assert extract_first_paragraph(text) == (
-            "First line of paragraph. "
-            "Second line of paragraph. "
-            "Third line of paragraph."
-        )
+    @pytest.mark.parametrize(
+        "fences, paragraph",
+        [
+            ("```rust\nfn main() {}\n```", "Real paragraph here."),
+            ('```toml\n[package]\nname = "example"\n```', "Description of the config."),
+            (
+                "```\nfirst block\n```\n\n```python\nsecond block\n```",
+                "The actual paragraph after two code blocks.",
+            ),
+        ],
+        ids=["rust-specifier", "toml-specifier", "multiple-fences"],
+    )
+    def test_code_fences_before_paragraph_are_skipped(self, fences, paragraph):
+        """Fences with language tags, and several fences in a row, are skipped."""
+        text = _FENCED_PARAGRAPH_TEMPLATE.format(fences=fences, paragraph=paragraph)
+        assert extract_first_paragraph(text) == paragraph
 
     def test_code_fence_contents_never_leak_into_result(self):
         """The original bug: code fence contents must never appear in the result.
@@ -335,47 +491,110 @@ leaked = true
         assert "leaked" not in result
         assert result == ""
 
-    def test_only_blank_lines_returns_empty(self):
-        """Input with only whitespace/blank lines returns an empty string."""
-        text = "\n\n   \n\n"
-        assert extract_first_paragraph(text) == ""
-
-    def test_no_heading_just_paragraph(self):
-        """A paragraph without any preceding heading is still extracted."""
-        text = "Just a paragraph with no heading."
-        assert extract_first_paragraph(text) == "Just a paragraph with no heading."
-
-    def test_heading_inside_code_fence_is_ignored(self):
-        """Headings inside a code fence are not treated as real headings."""
-        text = """\
-```
-# This is not a real heading
-```
-
-Actual paragraph."""
-        assert extract_first_paragraph(text) == "Actual paragraph."
-
-    def test_nested_backticks_in_code_fence(self):
-        """Backtick sequences shorter than ``` inside a fence do not close it."""
-        text = """\
-# Title
-
-```
-some `inline` code
-```
-
-The paragraph."""
-        assert extract_first_paragraph(text) == "The paragraph."
-
+    def test_repeated_text_is_memoized(self):
+        """Extracting from identical text again reuses the cached result."""
+        text = "Paragraph for the memoization test.\n\n# Memo\n"
+        cache_info = _mod.extract_title_and_paragraph.cache_info
+        first = extract_first_paragraph(text)
+        hits = cache_info().hits
+        assert _mod.extract_title(text) == "Memo"
+        assert extract_first_paragraph(text) == first
+        assert cache_info().hits == hits + 2
+
+    def test_title_and_paragraph_are_found_in_one_pass(self):
+        """The fused extractor finds an H1 that follows the paragraph."""
+        text = "Intro line.\n\n```md\n# Not a title\n```\n# Real Title\n"
+        assert _mod.extract_title_and_paragraph(text) == ("Real Title", "Intro line.")
+        assert _mod.extract_title_and_paragraph("```\n# Hidden\n") == ("(Untitled)", "")
+
+    def test_scan_stops_once_title_and_paragraph_are_found(self, monkeypatch):
+        """Blocks after the H1 and first paragraph are never matched."""
+        pattern = _mod._MARKDOWN_BLOCK_RE
+        matched = []
+
+        class CountingPattern:
+            def match(self, text, pos):
+                matched.append(pos)
+                return pattern.match(text, pos)
+
+        monkeypatch.setattr(_mod, "_MARKDOWN_BLOCK_RE", CountingPattern())
+        text = "# Title\n\nFirst paragraph.\n" + "\nMore text.\n" * 1000
+        scan = _mod.extract_title_and_paragraph.__wrapped__
+
+        assert scan(text) == ("Title", "First paragraph.")
+        assert len(matched) == 3
+
+    def test_large_adversarial_inputs(self):
+        """Long unclosed fences and runaway paragraphs are handled in one scan."""
+        unclosed = "```\n" + "~~~ ``\n" * 50_000
+        assert extract_first_paragraph(unclosed) == ""
+
+        runaway = "# T\n" + "word\n" * 50_000
+        assert extract_first_paragraph(runaway) == " ".join(["word"] * 50_000)
+
+        alternating = "~~~\n```\n~~~\n```\n~~~\n```\n" * 10_000 + "Tail."
+        assert extract_first_paragraph(alternating) == "Tail."
 
 # ===================================================================
 # Tests for crate version synchronization helpers
 # ===================================================================
 
 
+def _file_contains(path: Path, needle: bytes) -> bool:
+    """Search a file for ``needle`` without decoding it."""
+    return needle in path.read_bytes()
+
+
 class TestCrateVersionSync:
     """Tests for Cargo version parsing and version-reference synchronization."""
 
+    # Repository files holding stale version references, keyed by path
+    # relative to the fake repo root.
+    _SYNC_FIXTURE_FILES = {
+        "README.md": (
+            b'signal-fish-client = "0.1"\n'
+            b'signal-fish-client = { version = "0.1", default-features = false }\n'
+        ),
+        "docs/getting-started.md": (
+            b'signal-fish-client = "0.1"\n'
+            b'signal-fish-client = { version = "0.1", default-features = false }\n'
+            b'signal-fish-client = { version = "0.1", default-features = false, features = ["transport-websocket"] }\n'
+        ),
+        "docs/index.md": (
+            b'signal-fish-client = { version = "*", features = ["transport-websocket"] }\n'
+        ),
+        "docs/client.md": b'sdk_version: Some("0.1.0".into()),\n',
+        "docs/protocol.md": (
+            b"{\n"
+            b'  "type": "Authenticate",\n'
+            b'  "data": {\n'
+            b'    "sdk_version": "0.1.0",\n'
+            b'    "minimum_version": "0.1.0"\n'
+            b"  }\n"
+            b"}\n"
+        ),
+        ".llm/context.md": b"- **Version:** 0.1.0\n",
+        ".llm/skills/crate-publishing/SKILL.md": (
+            b"# Crate Publishing\n\n"
+            b"```toml\n"
+            b'[package]\nname = "signal-fish-client"\nversion = "0.1.0"\n'
+            b"```\n\n"
+            b"# Bump version (0.1.0 -> 0.2.0)\n"
+        ),
+    }
+
+    _EXPECTED_CHANGED_FILES = frozenset(
+        {
+            "README.md",
+            "docs/getting-started.md",
+            "docs/index.md",
+            "docs/client.md",
+            "docs/protocol.md",
+            ".llm/context.md",
+            ".llm/skills/crate-publishing/SKILL.md",
+        }
+    )
+
     def test_read_cargo_package_version(self, tmp_path, monkeypatch):
         """The package version is read from Cargo.toml [workspace.package]."""
         fake_root = tmp_path / "repo"
@@ -394,6 +613,57 @@ class TestCrateVersionSync:
 
         assert read_cargo_package_version() == "1.2.3"
 
+    @pytest.mark.parametrize("use_tomllib", [True, False], ids=["tomllib", "fallback"])
+    def test_read_cargo_package_version_missing_is_reported(
+        self, tmp_path, monkeypatch, use_tomllib
+    ):
+        """A Cargo.toml without [workspace.package].version raises RuntimeError."""
+        fake_root = tmp_path / "repo"
+        fake_root.mkdir()
+        (fake_root / "Cargo.toml").write_text(
+            '[package]\nversion = "9.9.9"\n\n[workspace.package]\nedition = "2021"\n',
+            encoding="utf-8",
+        )
+        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        if not use_tomllib:
+            monkeypatch.setattr(_mod, "tomllib", None)
+
+        with pytest.raises(RuntimeError, match="missing or invalid"):
+            read_cargo_package_version()
+
+    @pytest.mark.parametrize(
+        "manifest",
+        ['workspace = "oops"\n', "[workspace]\npackage = 1\n"],
+        ids=["workspace-not-table", "package-not-table"],
+    )
+    def test_read_cargo_package_version_rejects_non_table_sections(
+        self, tmp_path, monkeypatch, manifest
+    ):
+        """A scalar where a table belongs is reported, not an AttributeError."""
+        if _mod.tomllib is None:
+            pytest.skip("tomllib/tomli unavailable")
+        fake_root = tmp_path / "repo"
+        fake_root.mkdir()
+        (fake_root / "Cargo.toml").write_text(manifest, encoding="utf-8")
+        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+
+        with pytest.raises(RuntimeError, match="missing or invalid"):
+            read_cargo_package_version()
+
+    def test_read_cargo_package_version_reports_invalid_toml(
+        self, tmp_path, monkeypatch
+    ):
+        """Malformed TOML surfaces as a RuntimeError for the hook's error report."""
+        if _mod.tomllib is None:
+            pytest.skip("tomllib/tomli unavailable")
+        fake_root = tmp_path / "repo"
+        fake_root.mkdir()
+        (fake_root / "Cargo.toml").write_text("[workspace.package\n", encoding="utf-8")
+        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+
+        with pytest.raises(RuntimeError, match="Could not parse"):
+            read_cargo_package_version()
+
     def test_sync_crate_version_references_updates_target_files(
         self,
         tmp_path,
@@ -401,91 +671,80 @@ class TestCrateVersionSync:
     ):
         """Known version references are updated to the Cargo.toml version."""
         fake_root = tmp_path / "repo"
-        (fake_root / ".llm" / "skills").mkdir(parents=True)
-        (fake_root / "docs").mkdir(parents=True)
-
-        (fake_root / "README.md").write_text(
-            'signal-fish-client = "0.1"\n'
-            'signal-fish-client = { version = "0.1", default-features = false }\n',
-            encoding="utf-8",
-        )
-        (fake_root / "docs" / "getting-started.md").write_text(
-            'signal-fish-client = "0.1"\n'
-            'signal-fish-client = { version = "0.1", default-features = false }\n'
-            'signal-fish-client = { version = "0.1", default-features = false, features = ["transport-websocket"] }\n',
-            encoding="utf-8",
-        )
-        (fake_root / "docs" / "index.md").write_text(
-            'signal-fish-client = { version = "*", features = ["transport-websocket"] }\n',
-            encoding="utf-8",
+        for relative_path, data in self._SYNC_FIXTURE_FILES.items():
+            path = fake_root / relative_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        publishing_skill = (
+            fake_root / ".llm" / "skills" / "crate-publishing" / "SKILL.md"
         )
-        (fake_root / "docs" / "client.md").write_text(
-            'sdk_version: Some("0.1.0".into()),\n',
-            encoding="utf-8",
+
+        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+
+        errors, changed_files = sync_crate_version_references("1.2.3")
+
+        assert errors == []
+        assert (
+            frozenset(path.relative_to(fake_root).as_posix() for path in changed_files)
+            == self._EXPECTED_CHANGED_FILES
         )
-        (fake_root / "docs" / "protocol.md").write_text(
-            '{\n'
-            '  "type": "Authenticate",\n'
-            '  "data": {\n'
-            '    "sdk_version": "0.1.0",\n'
-            '    "minimum_version": "0.1.0"\n'
-            "  }\n"
-            "}\n",
-            encoding="utf-8",
+
+        assert _file_contains(fake_root / "README.md", b'signal-fish-client = "1.2.3"')
+        assert _file_contains(
+            fake_root / "docs" / "getting-started.md", b'version = "1.2.3"'
         )
-        (fake_root / ".llm" / "context.md").write_text(
-            "- **Version:** 0.1.0\n",
-            encoding="utf-8",
+        assert _file_contains(fake_root / "docs" / "index.md", b'version = "1.2.3"')
+        assert _file_contains(
+            fake_root / "docs" / "client.md", b'sdk_version: Some("1.2.3".into()),'
         )
-        publishing_skill = (
-            fake_root / ".llm" / "skills" / "crate-publishing" / "SKILL.md"
+        protocol = fake_root / "docs" / "protocol.md"
+        assert _file_contains(protocol, b'"sdk_version": "1.2.3"')
+        assert _file_contains(protocol, b'"minimum_version": "0.1.0"')
+        assert _file_contains(
+            fake_root / ".llm" / "context.md", b"- **Version:** 1.2.3"
         )
-        publishing_skill.parent.mkdir()
-        publishing_skill.write_text(
-            "# Crate Publishing\n\n"
-            "```toml\n"
-            '[package]\nname = "signal-fish-client"\nversion = "0.1.0"\n'
-            "```\n\n"
-            "# Bump version (0.1.0 -> 0.2.0)\n",
+        assert _file_contains(publishing_skill, b'version = "1.2.3"')
+        assert _file_contains(publishing_skill, b"# Bump version (0.1.0 -> 0.2.0)")
+
+    def test_version_replacement_table_targets_repository_files(self):
+        """Every sync target exists and every pattern captures the version group."""
+        for relative_path, patterns in _mod._VERSION_REPLACEMENTS:
+            assert (_mod.REPO_ROOT / relative_path).is_file(), relative_path
+            for pattern in patterns:
+                assert pattern.groups >= _mod._VERSION_GROUP, pattern.pattern
+
+    def test_sync_is_repeatable_with_different_versions(self, tmp_path, monkeypatch):
+        """The shared pattern table is not bound to the first version synced."""
+        fake_root = tmp_path / "repo"
+        fake_root.mkdir()
+        readme = fake_root / "README.md"
+        readme.write_text('signal-fish-client = "0.1"\n', encoding="utf-8")
+        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+
+        sync_crate_version_references("1.2.3")
+        sync_crate_version_references("2.0.0")
+
+        assert readme.read_text(encoding="utf-8") == 'signal-fish-client = "2.0.0"\n'
+
+    def test_sync_does_not_match_across_lines(self, tmp_path, monkeypatch):
+        """An unterminated quote must not pull the next line into the version."""
+        fake_root = tmp_path / "repo"
+        fake_root.mkdir()
+        readme = fake_root / "README.md"
+        readme.write_text(
+            'signal-fish-client = "0.1\n'
+            'signal-fish-client = "0.1"\n',
             encoding="utf-8",
         )
-
         monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
 
-        errors, changed_files = sync_crate_version_references("1.2.3")
+        errors, _ = sync_crate_version_references("1.2.3")
 
         assert errors == []
-        assert {path.relative_to(fake_root).as_posix() for path in changed_files} == {
-            "README.md",
-            "docs/getting-started.md",
-            "docs/index.md",
-            "docs/client.md",
-            "docs/protocol.md",
-            ".llm/context.md",
-            ".llm/skills/crate-publishing/SKILL.md",
-        }
-
-        assert 'signal-fish-client = "1.2.3"' in (
-            fake_root / "README.md"
-        ).read_text(encoding="utf-8")
-        assert 'version = "1.2.3"' in (
-            fake_root / "docs" / "getting-started.md"
-        ).read_text(encoding="utf-8")
-        assert 'version = "1.2.3"' in (
-            fake_root / "docs" / "index.md"
-        ).read_text(encoding="utf-8")
-        assert 'sdk_version: Some("1.2.3".into()),' in (
-            fake_root / "docs" / "client.md"
-        ).read_text(encoding="utf-8")
-        protocol = (fake_root / "docs" / "protocol.md").read_text(encoding="utf-8")
-        assert '"sdk_version": "1.2.3"' in protocol
-        assert '"minimum_version": "0.1.0"' in protocol
-        assert "- **Version:** 1.2.3" in (
-            fake_root / ".llm" / "context.md"
-        ).read_text(encoding="utf-8")
-        publishing = publishing_skill.read_text(encoding="utf-8")
-        assert 'version = "1.2.3"' in publishing
-        assert "# Bump version (0.1.0 -> 0.2.0)" in publishing
+        assert readme.read_text(encoding="utf-8") == (
+            'signal-fish-client = "0.1\n'
+            'signal-fish-client = "1.2.3"\n'
+        )
 
     def test_tilde_fence_is_skipped(self):
         """Tilde fences (~~~) are recognized and their content is skipped."""
@@ -598,19 +857,25 @@ class TestMainFunctionValidation:
 
     def test_main_workflow_step_comments_are_contiguous(self):
         """Numbered workflow comments in main() remain contiguous after edits."""
-        source = _SCRIPT_PATH.read_text(encoding="utf-8")
-        main_match = re.search(
-            r'def main\(\) -> int:\n(?P<body>.*?)(?:\n\nif __name__ == "__main__":)',
-            source,
-            flags=re.DOTALL,
-        )
-        assert main_match is not None, "Could not locate main() in pre-commit script."
-
-        main_body = main_match.group("body")
-        step_numbers = [
-            int(match.group(1))
-            for match in re.finditer(r"^\s*#\s+(\d+)\.\s", main_body, flags=re.MULTILINE)
-        ]
+        main = next(
+            (
+                node
+                for node in _script_tree().body
+                if isinstance(node, ast.FunctionDef) and node.name == "main"
+            ),
+            None,
+        )
+        assert main is not None, "Could not locate main() in pre-commit script."
+        assert not main.args.args and ast.unparse(main.returns) == "int"
+
+        with _SCRIPT_PATH.open("rb") as source:
+            step_numbers = [
+                int(match.group(1))
+                for token in tokenize.tokenize(source.readline)
+                if token.type == tokenize.COMMENT
+                and main.lineno <= token.start[0] <= main.end_lineno
+                and (match := _STEP_RE.match(token.string))
+            ]
 
         assert len(step_numbers) >= 10, (
             "Expected at least 10 numbered workflow comments in main(); "
@@ -637,6 +902,65 @@ class TestMainFunctionValidation:
         assert "crate version synchronization checks failed" in captured.err
         assert "Could not read Cargo.toml" in captured.err
 
+    def test_main_reports_devcontainer_validation_run_alongside_checks(
+        self, tmp_path, monkeypatch, capsys
+    ):
+        """The background devcontainer check's failure output is still reported."""
+        self._patch_main_for_isolated_error_reporting(monkeypatch, tmp_path)
+        scripts_dir = tmp_path / "repo" / "scripts"
+        scripts_dir.mkdir()
+        (scripts_dir / "validate-devcontainer-docs.sh").write_text(
+            "echo 'README mentions updateContentCommand'\nexit 1\n",
+            encoding="utf-8",
+        )
+        monkeypatch.setattr(_mod, "read_cargo_package_version", lambda: "1.2.3")
+        monkeypatch.setattr(_mod, "sync_crate_version_references", lambda _v: ([], []))
+        monkeypatch.setattr(_mod, "git_add", lambda _paths: None)
+        monkeypatch.setattr(_mod, "validate_changelog_added_api_entries", lambda: [])
+        monkeypatch.setattr(_mod, "validate_github_tool_order", lambda: [])
+        monkeypatch.setattr(_mod, "validate_plain_python_annotation_syntax", lambda: [])
+        monkeypatch.setattr(_mod, "warn_absolute_guarantee_language", lambda _files: [])
+
+        result = _mod.main()
+        captured = capsys.readouterr()
+
+        assert result == 0
+        assert "devcontainer documentation validation failed" in captured.err
+        assert "  README mentions updateContentCommand" in captured.err
+
+    def test_main_reaps_devcontainer_validation_when_a_check_raises(
+        self, tmp_path, monkeypatch
+    ):
+        """A crashing validator kills and collects the background script."""
+        self._patch_main_for_isolated_error_reporting(monkeypatch, tmp_path)
+        scripts_dir = tmp_path / "repo" / "scripts"
+        scripts_dir.mkdir()
+        (scripts_dir / "validate-devcontainer-docs.sh").write_text(
+            "sleep 30\n", encoding="utf-8"
+        )
+        monkeypatch.setattr(_mod, "read_cargo_package_version", lambda: "1.2.3")
+        monkeypatch.setattr(_mod, "sync_crate_version_references", lambda _v: ([], []))
+        monkeypatch.setattr(_mod, "git_add", lambda _paths: None)
+        started = []
+        popen = subprocess.Popen
+
+        def recording_popen(*args, **kwargs):
+            started.append(popen(*args, **kwargs))
+            return started[-1]
+
+        def crashing_check():
+            raise ValueError("validator bug")
+
+        monkeypatch.setattr(_mod.subprocess, "Popen", recording_popen)
+        monkeypatch.setattr(_mod, "validate_github_tool_order", crashing_check)
+
+        with pytest.raises(ValueError, match="validator bug"):
+            _mod.main()
+
+        assert len(started) == 1
+        assert started[0].returncode is not None
+        assert started[0].stdout.closed and started[0].stderr.closed
+
     def test_main_reports_sync_reference_write_failures(
         self, tmp_path, monkeypatch, capsys
     ):
@@ -683,84 +1007,167 @@ class TestMainFunctionValidation:
         assert "skills index generation failed" in captured.err
         assert "Could not write" in captured.err
 
+    def test_main_stages_synced_files_and_index_in_one_git_add(
+        self, tmp_path, monkeypatch
+    ):
+        """Version-sync targets and the generated index share one git add."""
+        self._patch_main_for_isolated_error_reporting(monkeypatch, tmp_path)
+        fake_root = tmp_path / "repo"
+        synced = fake_root / "README.md"
+        monkeypatch.setattr(_mod, "read_cargo_package_version", lambda: "1.2.3")
+        monkeypatch.setattr(
+            _mod, "sync_crate_version_references", lambda _v: ([], [synced])
+        )
+        staged = []
+        monkeypatch.setattr(_mod, "git_add", staged.append)
+        _write_modern_skill(
+            fake_root / ".llm" / "skills",
+            "example",
+            "Describe an example. Use when testing batched staging.",
+        )
 
-# ===================================================================
-# Tests for extract_title
-# ===================================================================
-
-
-class TestExtractTitle:
-    """Tests for the extract_title helper."""
-
-    def test_simple_h1_heading(self):
-        """A straightforward H1 heading is extracted."""
-        text = """\
-# My Title
-
-Some paragraph."""
-        assert extract_title(text) == "My Title"
-
-    def test_no_heading_returns_untitled(self):
-        """When there is no H1 heading, '(Untitled)' is returned."""
-        text = "Just some text without any heading."
-        assert extract_title(text) == "(Untitled)"
+        _mod.main()
 
-    def test_h2_heading_is_not_h1(self):
-        """An H2 heading (##) does not count as an H1."""
-        text = """\
-## Not An H1
+        assert staged == [[synced, fake_root / ".llm" / "skills" / "index.md"]]
 
-Paragraph."""
-        assert extract_title(text) == "(Untitled)"
+    def test_main_line_counts_include_newly_generated_index(
+        self, tmp_path, monkeypatch, capsys
+    ):
+        """An index created during the run is line-checked without a second walk."""
+        find_md_files = _mod.find_md_files
+        self._patch_main_for_isolated_error_reporting(monkeypatch, tmp_path)
+        walks = []
 
-    def test_multiple_headings_returns_first_h1(self):
-        """When multiple H1 headings exist, the first one is returned."""
-        text = """\
-# First Title
+        def counting_find_md_files(directory):
+            walks.append(directory)
+            return find_md_files(directory)
 
-Some text.
+        monkeypatch.setattr(_mod, "find_md_files", counting_find_md_files)
+        monkeypatch.setattr(_mod, "read_cargo_package_version", lambda: "1.2.3")
+        monkeypatch.setattr(_mod, "sync_crate_version_references", lambda _v: ([], []))
+        monkeypatch.setattr(_mod, "git_add", lambda _paths: None)
+        monkeypatch.setattr(_mod, "validate_changelog_added_api_entries", lambda: [])
+        monkeypatch.setattr(_mod, "validate_github_tool_order", lambda: [])
+        monkeypatch.setattr(_mod, "validate_plain_python_annotation_syntax", lambda: [])
+        monkeypatch.setattr(_mod, "warn_absolute_guarantee_language", lambda _files: [])
+        _write_modern_skill(
+            tmp_path / "repo" / ".llm" / "skills",
+            "example",
+            "Describe an example. Use when testing index line counts.",
+        )
 
-# Second Title
+        result = _mod.main()
+        captured = capsys.readouterr()
 
-More text."""
-        assert extract_title(text) == "First Title"
+        assert result == 0, captured.err
+        assert len(walks) == 1
+        assert str(Path(".llm/skills/index.md")) + ":" in captured.out
 
-    def test_h1_with_extra_whitespace(self):
-        """Leading/trailing whitespace around the title text is stripped."""
-        text = "#   Spaced Out Title   "
-        assert extract_title(text) == "Spaced Out Title"
+    @pytest.mark.parametrize(
+        "argv, full_scan", [([], False), (["--full"], True)], ids=["staged", "full"]
+    )
+    def test_main_guarantee_scan_covers_staged_files_unless_full(
+        self, tmp_path, monkeypatch, capsys, argv, full_scan
+    ):
+        """The advisory scans the staged Rust files; `--full` scans all of src/."""
+        self._patch_main_for_isolated_error_reporting(monkeypatch, tmp_path)
+        monkeypatch.setattr(_mod, "read_cargo_package_version", lambda: "1.2.3")
+        monkeypatch.setattr(_mod, "sync_crate_version_references", lambda _v: ([], []))
+        monkeypatch.setattr(_mod, "git_add", lambda _paths: None)
+        monkeypatch.setattr(_mod, "validate_changelog_added_api_entries", lambda: [])
+        monkeypatch.setattr(_mod, "validate_github_tool_order", lambda: [])
+        monkeypatch.setattr(_mod, "validate_plain_python_annotation_syntax", lambda: [])
+        staged = [tmp_path / "repo" / "src" / "lib.rs"]
+        monkeypatch.setattr(_mod, "staged_rust_sources", lambda: staged)
+        scanned = []
+        monkeypatch.setattr(
+            _mod,
+            "warn_absolute_guarantee_language",
+            lambda files: scanned.append(files) or [],
+        )
+        monkeypatch.setattr(_mod.sys, "argv", ["pre-commit-llm.py", *argv])
 
-    def test_empty_text_returns_untitled(self):
-        """An empty string input returns '(Untitled)'."""
-        assert extract_title("") == "(Untitled)"
+        assert _mod.main() == 0, capsys.readouterr().err
+        assert scanned == [None if full_scan else staged]
 
-    def test_h3_and_h4_are_not_h1(self):
-        """H3 and H4 headings are not treated as H1."""
-        text = """\
-### H3 Heading
-#### H4 Heading"""
-        assert extract_title(text) == "(Untitled)"
+    def test_main_leaves_unchanged_index_file_untouched(
+        self, tmp_path, monkeypatch, capsys
+    ):
+        """An index that already matches the generated content is not rewritten."""
+        self._patch_main_for_isolated_error_reporting(monkeypatch, tmp_path)
+        monkeypatch.setattr(_mod, "read_cargo_package_version", lambda: "1.2.3")
+        monkeypatch.setattr(_mod, "sync_crate_version_references", lambda _v: ([], []))
+        monkeypatch.setattr(_mod, "git_add", lambda _paths: None)
+        monkeypatch.setattr(_mod, "validate_changelog_added_api_entries", lambda: [])
+        monkeypatch.setattr(_mod, "validate_github_tool_order", lambda: [])
+        monkeypatch.setattr(_mod, "validate_plain_python_annotation_syntax", lambda: [])
+        monkeypatch.setattr(_mod, "warn_absolute_guarantee_language", lambda _files: [])
+        skills_dir = tmp_path / "repo" / ".llm" / "skills"
+        _write_modern_skill(
+            skills_dir,
+            "example",
+            "Describe an example. Use when testing index rewrites.",
+        )
+        index = skills_dir / "index.md"
 
-    def test_h1_inside_code_fence_is_ignored(self):
-        """H1 heading inside a code fence is not treated as the title."""
-        text = """\
-```markdown
-# Fake Title
-```
+        assert _mod.main() == 0
+        os.utime(index, ns=(1_000_000_000, 1_000_000_000))
+        assert _mod.main() == 0
+        capsys.readouterr()
 
-# Real Title
-"""
-        assert extract_title(text) == "Real Title"
+        assert index.stat().st_mtime_ns == 1_000_000_000
 
-    def test_h1_after_other_content(self):
-        """An H1 heading that appears after other content is still found."""
-        text = """\
-Some introductory text.
 
-# The Real Title
+# ===================================================================
+# Tests for extract_title
+# ===================================================================
+
+
+# (id, text, expected) cases for extract_title.
+_TITLE_CASES = (
+    ("simple-h1", "# My Title\n\nSome paragraph.", "My Title"),
+    ("no-heading", "Just some text without any heading.", "(Untitled)"),
+    ("h2-is-not-h1", "## Not An H1\n\nParagraph.", "(Untitled)"),
+    (
+        "multiple-headings-returns-first-h1",
+        "# First Title\n\nSome text.\n\n# Second Title\n\nMore text.",
+        "First Title",
+    ),
+    ("h1-with-extra-whitespace", "#   Spaced Out Title   ", "Spaced Out Title"),
+    ("empty-text", "", "(Untitled)"),
+    ("h3-and-h4-are-not-h1", "### H3 Heading\n#### H4 Heading", "(Untitled)"),
+    (
+        "h1-inside-code-fence-is-ignored",
+        "```markdown\n# Fake Title\n```\n\n# Real Title\n",
+        "Real Title",
+    ),
+    (
+        "h1-after-other-content",
+        "Some introductory text.\n\n# The Real Title\n\nMore content.",
+        "The Real Title",
+    ),
+    ("cr-only-line-breaks", "# Title\rBody\r# Other\n", "Title"),
+    ("unicode-line-separator", "# Title\u2028Body\n", "Title"),
+    ("empty-h1-then-fence", "# \x85```\n# Fenced\n```\n# Real\n", "Real"),
+)
+
+
+class TestExtractTitle:
+    """Tests for the extract_title helper."""
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [(text, expected) for _, text, expected in _TITLE_CASES],
+        ids=[case_id for case_id, _, _ in _TITLE_CASES],
+    )
+    def test_extract_title(self, text, expected):
+        """The first H1 outside code fences is the title, else '(Untitled)'."""
+        assert extract_title(text) == expected
 
-More content."""
-        assert extract_title(text) == "The Real Title"
+    def test_first_line_title_fast_path_matches_full_scan(self):
+        """An H1 on line one is read directly; a bare ``#`` falls back to the scan."""
+        assert extract_title("# Quick Title  \r\nBody\n") == "Quick Title"
+        assert extract_title("# \n```\n# Hidden\n```\n# Later\n") == "Later"
 
 
 # ===================================================================
@@ -773,21 +1180,58 @@ More content."""
 _UNDERSCORE_EMPHASIS_RE = re.compile(r"(?<!\w)_[^_\n]+_(?!\w)")
 
 
-def _make_skill_file(directory: Path, name: str, content: str) -> Path:
-    """Write a mock folder-based Agent Skill and return its SKILL.md path."""
+def _underscore_emphasis_violations(output: str) -> List[str]:
+    """Describe every MD049 violation in ``output``; empty when compliant.
+
+    The pattern never crosses a newline, so one ``finditer`` over the whole
+    output finds the same matches as a per-line loop. Output without any
+    underscore skips the regex entirely, and line numbers are only resolved
+    (by bisecting the newline offsets) when there is something to report.
+    """
+    if "_" not in output:
+        return []
+    hits = list(_UNDERSCORE_EMPHASIS_RE.finditer(output))
+    if not hits:
+        return []
+    newlines = [index for index, char in enumerate(output) if char == "\n"]
+    violations = []
+    for match in hits:
+        line_index = bisect.bisect_left(newlines, match.start())
+        line_start = newlines[line_index - 1] + 1 if line_index else 0
+        line_end = newlines[line_index] if line_index < len(newlines) else len(output)
+        violations.append(
+            f"MD049 violation on line {line_index + 1}: underscore emphasis "
+            f"{match.group()!r} in {output[line_start:line_end]!r}"
+        )
+    return violations
+
+
+def _make_skill_file(
+    directory: Path,
+    name: str,
+    content: str,
+    files: Optional[Dict[Path, str]] = None,
+) -> Path:
+    """Create a mock folder-based Agent Skill and return its SKILL.md path.
+
+    With ``files`` (the ``inmem_files`` fixture) the text is only recorded
+    in memory; otherwise it is written to disk.
+    """
     skill_name = Path(name).stem
-    skill_dir = directory / skill_name
-    skill_dir.mkdir(parents=True)
-    path = skill_dir / "SKILL.md"
+    path = directory / skill_name / "SKILL.md"
     description = extract_first_paragraph(content)
-    path.write_text(
+    text = (
         "---\n"
         f"name: {skill_name}\n"
         f"description: {description}\n"
         "---\n\n"
-        f"{content}",
-        encoding="utf-8",
+        f"{content}"
     )
+    if files is not None:
+        files[path] = text
+    else:
+        path.parent.mkdir(parents=True)
+        path.write_text(text, encoding="utf-8")
     return path
 
 
@@ -800,19 +1244,93 @@ def skills_dir(tmp_path, monkeypatch):
     return d
 
 
+@pytest.fixture()
+def inmem_files(monkeypatch):
+    """Serve file text from the returned ``{Path: str}`` dict, not the disk.
+
+    Every validator and generate_index read through ``read_text_cached`` (and
+    ``read_lines_cached``, which calls it); paths missing from the dict still
+    fall through to the filesystem.
+    """
+    files = {}
+    read_from_disk = _mod.read_text_cached
+
+    def read_text(path):
+        text = files.get(path)
+        return read_from_disk(path) if text is None else text
+
+    monkeypatch.setattr(_mod, "read_text_cached", read_text)
+    return files
+
+
+@pytest.fixture()
+def inmem_skill_doc(inmem_files, tmp_path, monkeypatch):
+    """Return ``make(content, name="skill.md") -> doc`` for in-memory ``.llm/`` docs.
+
+    Nothing is written; ``tmp_path`` only anchors REPO_ROOT so messages use
+    repo-relative paths.
+    """
+
+    def make(content: bytes, name: str = "skill.md") -> Path:
+        doc = tmp_path / ".llm" / name
+        inmem_files[doc] = content.decode("utf-8")
+        return doc
+
+    monkeypatch.setattr(_mod, "REPO_ROOT", tmp_path)
+    return make
+
+
+# Canonical single-skill body shared by the index structure tests.
+_SIMPLE_SKILL_CONTENT = "# Example Skill\n\nA short description.\n"
+
+# generate_index truncates descriptions to 120 characters: 117 kept + "...".
+_A117 = "A" * 117
+_TRUNC_MARKER = _A117 + "..."
+
+
+@pytest.fixture(scope="module")
+def simple_index_output(tmp_path_factory):
+    """generate_index output for one canonical skill, built once per module."""
+    skills = tmp_path_factory.mktemp("skills")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(_mod, "SKILLS_DIR", skills)
+        skill = _make_skill_file(skills, "example.md", _SIMPLE_SKILL_CONTENT)
+        return generate_index([skill])
+
+
+_MULTI_SKILL_COUNT = 10
+
+
+@pytest.fixture(scope="module")
+def multi_skill_index_output(tmp_path_factory):
+    """generate_index output for ten on-disk skills, built once per module.
+
+    The files are written to disk so ``discover_skill_files`` is exercised too.
+    """
+    skills = tmp_path_factory.mktemp("multi_skills")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(_mod, "SKILLS_DIR", skills)
+        for i in range(_MULTI_SKILL_COUNT):
+            path = skills / f"skill-{i:02d}" / "SKILL.md"
+            path.parent.mkdir()
+            path.write_bytes(
+                (
+                    f"---\nname: skill-{i:02d}\n"
+                    f"description: Description for skill {i}.\n---\n\n"
+                    f"# Skill Number {i}\n\nDescription for skill {i}.\n"
+                ).encode("ascii")
+            )
+        return generate_index(_mod.discover_skill_files(skills))
+
+
 class TestGenerateIndex:
     """Tests for the generate_index function."""
 
     # -- (a) Footer uses asterisk emphasis, not underscore emphasis ----------
 
-    def test_footer_uses_asterisk_emphasis(self, skills_dir):
+    def test_footer_uses_asterisk_emphasis(self, simple_index_output):
         """The footer line uses *...* (asterisk) emphasis, not _..._ (underscore)."""
-        skill = _make_skill_file(
-            skills_dir,
-            "example.md",
-            "# Example Skill\n\nA short description.\n",
-        )
-        output = generate_index([skill])
+        output = simple_index_output
         footer_lines = [
             line for line in output.splitlines() if "Generated by" in line
         ]
@@ -825,57 +1343,41 @@ class TestGenerateIndex:
 
     # -- (b) No underscore emphasis anywhere in the output -------------------
 
-    def test_no_underscore_emphasis_anywhere(self, skills_dir):
+    def test_no_underscore_emphasis_anywhere(self, simple_index_output):
         """The entire generated output must be free of underscore emphasis."""
-        skill = _make_skill_file(
-            skills_dir,
-            "example.md",
-            "# Example Skill\n\nA short description.\n",
-        )
-        output = generate_index([skill])
-        matches = _UNDERSCORE_EMPHASIS_RE.findall(output)
-        assert matches == [], (
-            f"Found underscore emphasis in generated index: {matches}"
-        )
+        output = simple_index_output
+        assert _underscore_emphasis_violations(output) == []
 
     # -- (c) Index starts with H1 -------------------------------------------
 
-    def test_index_starts_with_h1(self, skills_dir):
+    def test_index_starts_with_h1(self, simple_index_output):
         """The generated index must start with '# Skills Index'."""
-        skill = _make_skill_file(
-            skills_dir,
-            "example.md",
-            "# Example Skill\n\nDescription.\n",
-        )
-        output = generate_index([skill])
+        output = simple_index_output
         first_line = output.splitlines()[0]
         assert first_line == "# Skills Index"
 
     # -- (d) Index contains auto-generated notice ---------------------------
 
-    def test_index_contains_auto_generated_notice(self, skills_dir):
+    def test_index_contains_auto_generated_notice(self, simple_index_output):
         """The generated output must contain the AUTO-GENERATED notice."""
-        skill = _make_skill_file(
-            skills_dir,
-            "example.md",
-            "# Example Skill\n\nDescription.\n",
-        )
-        output = generate_index([skill])
+        output = simple_index_output
         assert "AUTO-GENERATED" in output
 
     # -- (e) Index contains skill entries with links -------------------------
 
-    def test_index_contains_skill_entries(self, skills_dir):
+    def test_index_contains_skill_entries(self, skills_dir, inmem_files):
         """Given mock skill files, the generated index contains entries with links."""
         skill_a = _make_skill_file(
             skills_dir,
             "alpha.md",
             "# Alpha Skill\n\nAlpha does alpha things.\n",
+            inmem_files,
         )
         skill_b = _make_skill_file(
             skills_dir,
             "beta.md",
             "# Beta Skill\n\nBeta does beta things.\n",
+            inmem_files,
         )
         output = generate_index([skill_a, skill_b])
         # Each skill should appear as an H3 link
@@ -885,91 +1387,63 @@ class TestGenerateIndex:
         assert "Alpha does alpha things." in output
         assert "Beta does beta things." in output
 
-    @pytest.mark.parametrize(
-        "filename, title, description",
-        [
+    def test_index_contains_parameterized_skill_entries(self, skills_dir, inmem_files):
+        """Each skill file in a batch produces a matching entry."""
+        cases = [
             ("async-rust.md", "Async Rust Patterns", "Patterns for async Rust."),
             ("error-handling.md", "Error Handling", "How to handle errors."),
             ("testing.md", "Testing Guide", "Guide for writing tests."),
-        ],
-    )
-    def test_index_contains_parameterized_skill_entries(
-        self, skills_dir, filename, title, description
-    ):
-        """Parameterized: each skill file produces a matching entry."""
-        skill = _make_skill_file(
-            skills_dir,
-            filename,
-            f"# {title}\n\n{description}\n",
-        )
-        output = generate_index([skill])
-        assert f"### [{title}]({Path(filename).stem}/SKILL.md)" in output
-        assert description in output
-
-    # -- (f) markdownlint MD049 compliance -----------------------------------
-
-    def test_markdownlint_md049_compliance(self, skills_dir):
-        """No line in the generated output uses underscore-delimited emphasis
-        (MD049 violation).  This is the most critical compliance test."""
-        skill = _make_skill_file(
-            skills_dir,
-            "example.md",
-            "# Example Skill\n\nA short description.\n",
-        )
-        output = generate_index([skill])
-        for lineno, line in enumerate(output.splitlines(), start=1):
-            match = _UNDERSCORE_EMPHASIS_RE.search(line)
-            assert match is None, (
-                f"MD049 violation on line {lineno}: underscore emphasis "
-                f"found {match.group()!r} in line: {line!r}"
+        ]
+        skills = [
+            _make_skill_file(
+                skills_dir, filename, f"# {title}\n\n{description}\n", inmem_files
             )
+            for filename, title, description in cases
+        ]
+        output = generate_index(sorted(skills))
+        for filename, title, description in cases:
+            assert f"### [{title}]({Path(filename).stem}/SKILL.md)" in output
+            assert description in output
 
-    @pytest.mark.parametrize(
-        "line",
-        [
-            "*Generated by `scripts/pre-commit-llm.py`. "
-            "Run `bash scripts/install-hooks.sh` to install the pre-commit hook.*",
-            "*Some other emphasized text.*",
-        ],
-        ids=["footer", "generic-emphasis"],
-    )
-    def test_md049_asterisk_emphasis_is_allowed(self, line):
-        """Asterisk emphasis is valid and must not trigger MD049 detection."""
-        assert _UNDERSCORE_EMPHASIS_RE.search(line) is None, (
-            f"False positive: asterisk emphasis incorrectly matched: {line!r}"
-        )
+    # -- (f) markdownlint MD049 compliance -----------------------------------
 
     @pytest.mark.parametrize(
-        "line",
+        "line, should_match",
         [
-            "_Generated by some tool._",
-            "_italic text_",
-            "Some _emphasized_ word.",
+            (
+                "*Generated by `scripts/pre-commit-llm.py`. "
+                "Run `bash scripts/install-hooks.sh` to install the pre-commit hook.*",
+                False,
+            ),
+            ("*Some other emphasized text.*", False),
+            ("_Generated by some tool._", True),
+            ("_italic text_", True),
+            ("Some _emphasized_ word.", True),
         ],
-        ids=["full-line", "simple", "inline"],
+        ids=["footer", "generic-emphasis", "full-line", "simple", "inline"],
     )
-    def test_md049_underscore_emphasis_is_detected(self, line):
-        """The underscore emphasis regex correctly detects violations."""
-        assert _UNDERSCORE_EMPHASIS_RE.search(line) is not None, (
-            f"Expected underscore emphasis to be detected in: {line!r}"
+    def test_md049_underscore_emphasis_detection(self, line, should_match):
+        """Underscore emphasis is detected; asterisk emphasis never matches."""
+        assert (_UNDERSCORE_EMPHASIS_RE.search(line) is not None) is should_match, (
+            f"Expected match={should_match} for: {line!r}"
         )
 
-    def test_md049_compliance_with_multiple_skills(self, skills_dir):
+    def test_md049_compliance_with_multiple_skills(self, multi_skill_index_output):
         """MD049 compliance holds even with many skill files producing a large index."""
-        for i in range(10):
-            _make_skill_file(
-                skills_dir,
-                f"skill-{i:02d}.md",
-                f"# Skill Number {i}\n\nDescription for skill {i}.\n",
-            )
-        skill_files = _mod.discover_skill_files(skills_dir)
-        output = generate_index(skill_files)
-        for lineno, line in enumerate(output.splitlines(), start=1):
-            match = _UNDERSCORE_EMPHASIS_RE.search(line)
-            assert match is None, (
-                f"MD049 violation on line {lineno}: {match.group()!r} "
-                f"in: {line!r}"
+        assert _underscore_emphasis_violations(multi_skill_index_output) == []
+
+    def test_multiple_skills_are_listed_in_discovery_order(
+        self, multi_skill_index_output
+    ):
+        """Every discovered skill gets an entry, in sorted directory order."""
+        positions = [
+            multi_skill_index_output.find(
+                f"### [Skill Number {i}](skill-{i:02d}/SKILL.md)"
             )
+            for i in range(_MULTI_SKILL_COUNT)
+        ]
+        assert -1 not in positions
+        assert positions == sorted(positions)
 
     def test_empty_skill_list_produces_valid_index(self, skills_dir):
         """Even with no skill files, the index structure is valid."""
@@ -977,21 +1451,20 @@ class TestGenerateIndex:
         assert output.splitlines()[0] == "# Skills Index"
         assert "AUTO-GENERATED" in output
         # No underscore emphasis should appear
-        assert _UNDERSCORE_EMPHASIS_RE.search(output) is None
+        assert _underscore_emphasis_violations(output) == []
 
-    def test_skill_with_long_description_is_truncated(self, skills_dir):
+    def test_skill_with_long_description_is_truncated(self, skills_dir, inmem_files):
         """Descriptions longer than 120 characters are truncated with '...'."""
         long_desc = "A" * 200
         skill = _make_skill_file(
             skills_dir,
             "verbose.md",
             f"# Verbose Skill\n\n{long_desc}\n",
+            inmem_files,
         )
         output = generate_index([skill])
-        # The description in the output should be truncated to 120 chars
-        # (117 chars + "...")
         assert long_desc not in output
-        assert "A" * 117 + "..." in output
+        assert _TRUNC_MARKER in output
 
 
 # ===================================================================
@@ -1036,6 +1509,24 @@ class TestModernSkillLayout:
 
         assert _mod.discover_skill_files(skills_dir) == [skill]
 
+    def test_layout_rejects_flat_guides_and_empty_skill_dirs(self, tmp_path):
+        skills_dir = tmp_path / "skills"
+        skills_dir.mkdir()
+        skill = _write_modern_skill(
+            skills_dir,
+            "async-rust-patterns",
+            "Guide async Rust changes. Use when editing Tokio client code.",
+        )
+        (skills_dir / "legacy.md").write_text("# Legacy\n", encoding="utf-8")
+        (skills_dir / "index.md").write_text("# Index\n", encoding="utf-8")
+        (skills_dir / "orphan").mkdir()
+
+        errors = _mod.validate_skill_layout(skills_dir, [skill])
+
+        assert len(errors) == 2
+        assert "legacy.md: legacy flat skill" in errors[0]
+        assert "orphan: skill directory is missing `SKILL.md`" in errors[1]
+
     def test_valid_skill_metadata_passes(self, tmp_path):
         skills_dir = tmp_path / "skills"
         skill = _write_modern_skill(
@@ -1104,20 +1595,34 @@ class TestModernSkillLayout:
 # ===================================================================
 
 
+def _fake_repo(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    files: Dict[str, bytes],
+    docs_dir: bool = True,
+) -> Path:
+    """Create ``tmp_path/"repo"`` holding ``files`` and point REPO_ROOT at it.
+
+    ``files`` maps repo-relative POSIX paths to their bytes; ``docs/`` is
+    created even when no file lands in it unless ``docs_dir`` is false.
+    """
+    fake_root = tmp_path / "repo"
+    (fake_root / "docs" if docs_dir else fake_root).mkdir(parents=True)
+    for relative_path, data in files.items():
+        path = fake_root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+    return fake_root
+
+
 class TestValidateMkdocsNav:
     """Tests for the validate_mkdocs_nav function and its I/O error handling."""
 
     def test_unreadable_mkdocs_yml(self, tmp_path, monkeypatch):
         """When read_text raises OSError, validate_mkdocs_nav returns an error message."""
         # Set up a fake repo root with mkdocs.yml and docs/ present
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        mkdocs_yml = fake_root / "mkdocs.yml"
-        mkdocs_yml.write_text("nav:\n  - Home: index.md\n", encoding="utf-8")
-        docs_dir = fake_root / "docs"
-        docs_dir.mkdir()
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        _fake_repo(tmp_path, monkeypatch, {"mkdocs.yml": b"nav:\n  - Home: index.md\n"})
 
         # Mock read_text to raise OSError when called on the mkdocs.yml path
         original_read_text = Path.read_text
@@ -1137,22 +1642,13 @@ class TestValidateMkdocsNav:
     def test_is_file_oserror_continues(self, tmp_path, monkeypatch):
         """When is_file raises OSError for one entry, the error is reported
         but validation continues checking subsequent entries."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        docs_dir = fake_root / "docs"
-        docs_dir.mkdir()
-
         # Create mkdocs.yml with two nav entries
-        mkdocs_yml = fake_root / "mkdocs.yml"
-        mkdocs_yml.write_text(
-            "nav:\n"
-            "  - First: first.md\n"
-            "  - Second: second.md\n",
-            encoding="utf-8",
-        )
-
         # Neither file exists, but first.md will raise OSError on is_file
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        _fake_repo(
+            tmp_path,
+            monkeypatch,
+            {"mkdocs.yml": b"nav:\n  - First: first.md\n  - Second: second.md\n"},
+        )
 
         original_is_file = Path.is_file
 
@@ -1177,94 +1673,78 @@ class TestValidateMkdocsNav:
 
     def test_valid_nav_no_errors(self, tmp_path, monkeypatch):
         """When all nav-referenced files exist, no errors are returned."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        docs_dir = fake_root / "docs"
-        docs_dir.mkdir()
-
-        # Create the referenced files
-        (docs_dir / "index.md").write_text("# Home\n", encoding="utf-8")
-        (docs_dir / "guide.md").write_text("# Guide\n", encoding="utf-8")
-
-        mkdocs_yml = fake_root / "mkdocs.yml"
-        mkdocs_yml.write_text(
-            "nav:\n"
-            "  - Home: index.md\n"
-            "  - Guide: guide.md\n",
-            encoding="utf-8",
+        _fake_repo(
+            tmp_path,
+            monkeypatch,
+            {
+                "docs/index.md": b"# Home\n",
+                "docs/guide.md": b"# Guide\n",
+                "mkdocs.yml": b"nav:\n  - Home: index.md\n  - Guide: guide.md\n",
+            },
         )
 
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
-
         errors = validate_mkdocs_nav()
         assert errors == []
 
+    def test_only_nav_section_is_checked(self, tmp_path, monkeypatch):
+        """Entries outside the nav section are ignored; line numbers are kept."""
+        mkdocs_yml = (
+            b"extra_css:\n"
+            b"  - Styles: before.md\n"
+            b"nav:\n"
+            b"  # - Draft: draft.md\n"
+            b"  - Missing: missing.md\n"
+            b"# trailing comment\n"
+            b"plugins:\n"
+            b"  - After: after.md\n"
+        )
+        _fake_repo(tmp_path, monkeypatch, {"mkdocs.yml": mkdocs_yml})
+
+        errors = validate_mkdocs_nav()
+        assert errors == [
+            "  mkdocs.yml nav (line 5) references 'missing.md' but "
+            "docs/missing.md does not exist."
+        ]
+
     def test_no_mkdocs_yml_returns_empty(self, tmp_path, monkeypatch):
         """When REPO_ROOT has no mkdocs.yml, validate_mkdocs_nav returns an empty list."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        _fake_repo(tmp_path, monkeypatch, {}, docs_dir=False)
 
         errors = validate_mkdocs_nav()
         assert errors == []
 
     def test_no_docs_dir_returns_empty(self, tmp_path, monkeypatch):
         """When REPO_ROOT has mkdocs.yml but no docs/ directory, returns empty list."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-
-        mkdocs_yml = fake_root / "mkdocs.yml"
-        mkdocs_yml.write_text(
-            "nav:\n"
-            "  - Home: index.md\n",
-            encoding="utf-8",
+        _fake_repo(
+            tmp_path,
+            monkeypatch,
+            {"mkdocs.yml": b"nav:\n  - Home: index.md\n"},
+            docs_dir=False,
         )
 
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
-
         errors = validate_mkdocs_nav()
         assert errors == []
 
     def test_bare_entry_without_label(self, tmp_path, monkeypatch):
         """A bare nav entry like `- index.md` (no label) produces no errors
         when the file exists."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        docs_dir = fake_root / "docs"
-        docs_dir.mkdir()
-
-        # Create the referenced file
-        (docs_dir / "index.md").write_text("# Home\n", encoding="utf-8")
-
-        mkdocs_yml = fake_root / "mkdocs.yml"
-        mkdocs_yml.write_text(
-            "nav:\n"
-            "  - index.md\n",
-            encoding="utf-8",
+        _fake_repo(
+            tmp_path,
+            monkeypatch,
+            {"docs/index.md": b"# Home\n", "mkdocs.yml": b"nav:\n  - index.md\n"},
         )
 
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
-
         errors = validate_mkdocs_nav()
         assert errors == []
 
     def test_missing_nav_file_reports_error(self, tmp_path, monkeypatch):
         """A nav entry pointing to a non-existent file produces an error."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        docs_dir = fake_root / "docs"
-        docs_dir.mkdir()
-
-        mkdocs_yml = fake_root / "mkdocs.yml"
-        mkdocs_yml.write_text(
-            "nav:\n"
-            "  - Missing: does-not-exist.md\n",
-            encoding="utf-8",
+        _fake_repo(
+            tmp_path,
+            monkeypatch,
+            {"mkdocs.yml": b"nav:\n  - Missing: does-not-exist.md\n"},
         )
 
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
-
         errors = validate_mkdocs_nav()
         assert len(errors) == 1
         assert "does-not-exist.md" in errors[0]
@@ -1276,53 +1756,117 @@ class TestValidateMkdocsNav:
 # ===================================================================
 
 
+def _fenced_doc(
+    title: str, fence_open: str, lines: List[str], fence_close: str
+) -> bytes:
+    """Encode a titled markdown document holding one fenced block."""
+    doc_lines = [f"# {title}", "", fence_open, *lines, fence_close, ""]
+    return "\n".join(doc_lines).encode("utf-8")
+
+
+# Markdown fixtures for the YAML step-indentation tests, keyed by file name
+# and encoded once at import.
+_FENCED_DOCS = {
+    "example.md": "\n".join(
+        [
+            "# Example",
+            "",
+            "```yaml",
+            "- name: Test on MSRV",
+            "  uses: dtolnay/rust-toolchain@stable",
+            "  with:",
+            "    toolchain: 1.85.0",
+            "- run: cargo test --all-features",
+            "```",
+            "",
+        ]
+    ).encode("utf-8"),
+    "bad-example.md": "\n".join(
+        [
+            "# Bad Example",
+            "",
+            "```yaml",
+            "- name: Test on MSRV",
+            "    uses: dtolnay/rust-toolchain@stable",
+            "    with:",
+            "      toolchain: 1.85.0",
+            "- run: cargo test --all-features",
+            "```",
+            "",
+        ]
+    ).encode("utf-8"),
+    "under-indented.md": "\n".join(
+        [
+            "# Under-indented Example",
+            "",
+            "```yaml",
+            "- name: Test on MSRV",
+            " uses: dtolnay/rust-toolchain@stable",
+            " with:",
+            "   toolchain: 1.85.0",
+            " run: cargo test --all-features",
+            "```",
+            "",
+        ]
+    ).encode("utf-8"),
+    "nested-with-name.md": "\n".join(
+        [
+            "# Nested with name",
+            "",
+            "```yaml",
+            "- name: Build",
+            "  uses: actions/cache@v4",
+            "  with:",
+            "    name: rust-cache",
+            "    path: target",
+            "- run: cargo test --all-features",
+            "```",
+            "",
+        ]
+    ).encode("utf-8"),
+    "nested-list-with.md": "\n".join(
+        [
+            "# Nested list under with",
+            "",
+            "```yaml",
+            "- name: Build",
+            "  uses: actions/example@v1",
+            "  with:",
+            "    include:",
+            "      - linux",
+            "      - macos",
+            "  run: echo done",
+            "```",
+            "",
+        ]
+    ).encode("utf-8"),
+    "shell-example.md": "\n".join(
+        [
+            "# Shell Example",
+            "",
+            "```bash",
+            "- name: Not YAML",
+            "    uses: dtolnay/rust-toolchain@stable",
+            "```",
+            "",
+        ]
+    ).encode("utf-8"),
+}
+
+
 class TestValidateYamlStepIndentation:
     """Tests for fenced YAML step indentation validation."""
 
-    def test_valid_yaml_step_indentation_passes(self, tmp_path, monkeypatch):
+    def test_valid_yaml_step_indentation_passes(self, inmem_skill_doc):
         """Correctly aligned step keys in fenced YAML should not error."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        llm_dir = fake_root / ".llm"
-        llm_dir.mkdir()
-        doc = llm_dir / "example.md"
-        doc.write_text(
-            "# Example\n\n"
-            "```yaml\n"
-            "- name: Test on MSRV\n"
-            "  uses: dtolnay/rust-toolchain@stable\n"
-            "  with:\n"
-            "    toolchain: 1.85.0\n"
-            "- run: cargo test --all-features\n"
-            "```\n",
-            encoding="utf-8",
-        )
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        doc = inmem_skill_doc(_FENCED_DOCS["example.md"], "example.md")
 
         errors = validate_yaml_step_indentation([doc])
         assert errors == []
 
-    def test_over_indented_uses_is_reported(self, tmp_path, monkeypatch):
+    def test_over_indented_uses_is_reported(self, inmem_skill_doc):
         """Over-indented uses/with keys in fenced YAML should be blocked."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        llm_dir = fake_root / ".llm"
-        llm_dir.mkdir()
-        doc = llm_dir / "bad-example.md"
-        doc.write_text(
-            "# Bad Example\n\n"
-            "```yaml\n"
-            "- name: Test on MSRV\n"
-            "    uses: dtolnay/rust-toolchain@stable\n"
-            "    with:\n"
-            "      toolchain: 1.85.0\n"
-            "- run: cargo test --all-features\n"
-            "```\n",
-            encoding="utf-8",
-        )
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        doc = inmem_skill_doc(_FENCED_DOCS["bad-example.md"], "bad-example.md")
 
         errors = validate_yaml_step_indentation([doc])
         assert len(errors) == 2
@@ -1330,26 +1874,9 @@ class TestValidateYamlStepIndentation:
         assert "`uses:` is over-indented" in errors[0]
         assert "`with:` is over-indented" in errors[1]
 
-    def test_under_indented_step_keys_are_reported(self, tmp_path, monkeypatch):
+    def test_under_indented_step_keys_are_reported(self, inmem_skill_doc):
         """Under-indented uses/with/run keys in a step should be blocked."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        llm_dir = fake_root / ".llm"
-        llm_dir.mkdir()
-        doc = llm_dir / "under-indented.md"
-        doc.write_text(
-            "# Under-indented Example\n\n"
-            "```yaml\n"
-            "- name: Test on MSRV\n"
-            " uses: dtolnay/rust-toolchain@stable\n"
-            " with:\n"
-            "   toolchain: 1.85.0\n"
-            " run: cargo test --all-features\n"
-            "```\n",
-            encoding="utf-8",
-        )
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        doc = inmem_skill_doc(_FENCED_DOCS["under-indented.md"], "under-indented.md")
 
         errors = validate_yaml_step_indentation([doc])
         assert len(errors) == 3
@@ -1358,151 +1885,57 @@ class TestValidateYamlStepIndentation:
         assert "`with:` is under-indented" in errors[1]
         assert "`run:` is under-indented" in errors[2]
 
-    def test_nested_with_name_mapping_passes(self, tmp_path, monkeypatch):
+    def test_nested_with_name_mapping_passes(self, inmem_skill_doc):
         """A plain nested `name:` under `with` should not be treated as a step key."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        llm_dir = fake_root / ".llm"
-        llm_dir.mkdir()
-        doc = llm_dir / "nested-with-name.md"
-        doc.write_text(
-            "# Nested with name\n\n"
-            "```yaml\n"
-            "- name: Build\n"
-            "  uses: actions/cache@v4\n"
-            "  with:\n"
-            "    name: rust-cache\n"
-            "    path: target\n"
-            "- run: cargo test --all-features\n"
-            "```\n",
-            encoding="utf-8",
-        )
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        name = "nested-with-name.md"
+        doc = inmem_skill_doc(_FENCED_DOCS[name], name)
 
         errors = validate_yaml_step_indentation([doc])
         assert errors == []
 
     def test_nested_list_under_with_does_not_reset_step_alignment(
         self,
-        tmp_path,
-        monkeypatch,
+        inmem_skill_doc,
     ):
         """Nested list items under `with` should not change sibling step-key alignment."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        llm_dir = fake_root / ".llm"
-        llm_dir.mkdir()
-        doc = llm_dir / "nested-list-with.md"
-        doc.write_text(
-            "# Nested list under with\n\n"
-            "```yaml\n"
-            "- name: Build\n"
-            "  uses: actions/example@v1\n"
-            "  with:\n"
-            "    include:\n"
-            "      - linux\n"
-            "      - macos\n"
-            "  run: echo done\n"
-            "```\n",
-            encoding="utf-8",
-        )
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        name = "nested-list-with.md"
+        doc = inmem_skill_doc(_FENCED_DOCS[name], name)
 
         errors = validate_yaml_step_indentation([doc])
         assert errors == []
 
-    @pytest.mark.parametrize(
-        "fence_open,fence_close",
-        [
-            ("~~~yaml", "~~~"),
-            ("~~~YML", "~~~"),
-        ],
-    )
-    def test_tilde_yaml_fence_is_validated(
-        self,
-        tmp_path,
-        monkeypatch,
-        fence_open,
-        fence_close,
-    ):
-        """YAML in tilde fences should be validated the same as backticks."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        llm_dir = fake_root / ".llm"
-        llm_dir.mkdir()
-        doc = llm_dir / "tilde-yaml.md"
-        doc.write_text(
-            "# Tilde YAML\n\n"
-            f"{fence_open}\n"
-            "- name: Test on MSRV\n"
-            "    uses: dtolnay/rust-toolchain@stable\n"
-            f"{fence_close}\n",
-            encoding="utf-8",
-        )
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
-
-        errors = validate_yaml_step_indentation([doc])
-        assert len(errors) == 1
-        assert "`uses:` is over-indented" in errors[0]
-
-    @pytest.mark.parametrize(
-        "fence_open",
-        [
-            "```yaml",
-            "```YAML",
-            "``` yml",
-            "```   Yaml   ",
-            "~~~ yaml",
-        ],
-    )
-    def test_fence_language_case_and_spacing_variants_are_supported(
-        self,
-        tmp_path,
-        monkeypatch,
-        fence_open,
-    ):
-        """Fence language parsing should honor supported case/spacing variants."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        llm_dir = fake_root / ".llm"
-        llm_dir.mkdir()
-        doc = llm_dir / "fence-variants.md"
-        close = "~~~" if fence_open.startswith("~~~") else "```"
-        doc.write_text(
-            "# Fence Variants\n\n"
-            f"{fence_open}\n"
-            "- name: Build\n"
-            "    run: cargo test --all-features\n"
-            f"{close}\n",
-            encoding="utf-8",
-        )
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+    def test_fence_language_variants_are_validated(self, inmem_skill_doc):
+        """Tilde fences and case/spacing variants of the yaml tag are checked."""
+        tilde_step = ["- name: Test on MSRV", "    uses: dtolnay/rust-toolchain@stable"]
+        build_step = ["- name: Build", "    run: cargo test --all-features"]
+        variants = [
+            # YAML in tilde fences is validated the same as backticks.
+            ("~~~yaml", "~~~", tilde_step, "`uses:` is over-indented"),
+            ("~~~YML", "~~~", tilde_step, "`uses:` is over-indented"),
+            # Fence language parsing honors case and spacing variants.
+            ("```yaml", "```", build_step, "`run:` is over-indented"),
+            ("```YAML", "```", build_step, "`run:` is over-indented"),
+            ("``` yml", "```", build_step, "`run:` is over-indented"),
+            ("```   Yaml   ", "```", build_step, "`run:` is over-indented"),
+            ("~~~ yaml", "~~~", build_step, "`run:` is over-indented"),
+        ]
+        docs = [
+            inmem_skill_doc(
+                _fenced_doc("Fence Variant", fence_open, lines, fence_close),
+                f"fence-variant-{index}.md",
+            )
+            for index, (fence_open, fence_close, lines, _) in enumerate(variants)
+        ]
 
-        errors = validate_yaml_step_indentation([doc])
-        assert len(errors) == 1
-        assert "`run:` is over-indented" in errors[0]
+        errors = validate_yaml_step_indentation(docs)
+        assert len(errors) == len(variants)
+        for doc, error, (fence_open, _, _, message) in zip(docs, errors, variants):
+            assert doc.name in error, fence_open
+            assert message in error, fence_open
 
-    def test_non_yaml_fence_is_ignored(self, tmp_path, monkeypatch):
+    def test_non_yaml_fence_is_ignored(self, inmem_skill_doc):
         """Workflow-like snippets in non-yaml fences should not be checked."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        llm_dir = fake_root / ".llm"
-        llm_dir.mkdir()
-        doc = llm_dir / "shell-example.md"
-        doc.write_text(
-            "# Shell Example\n\n"
-            "```bash\n"
-            "- name: Not YAML\n"
-            "    uses: dtolnay/rust-toolchain@stable\n"
-            "```\n",
-            encoding="utf-8",
-        )
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        doc = inmem_skill_doc(_FENCED_DOCS["shell-example.md"], "shell-example.md")
 
         errors = validate_yaml_step_indentation([doc])
         assert errors == []
@@ -1518,49 +1951,36 @@ class TestValidateDocNavCardConsistency:
 
     def test_matching_labels_no_errors(self, tmp_path, monkeypatch):
         """When card labels match the target file H1 headings, no errors are returned."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        docs_dir = fake_root / "docs"
-        docs_dir.mkdir()
-
-        # Create a target page with an H1 heading
-        (docs_dir / "getting-started.md").write_text(
-            "# Getting Started\n\nSome content.\n",
-            encoding="utf-8",
-        )
-
-        # Create docs/index.md with a matching nav card
-        (docs_dir / "index.md").write_text(
-            "# Home\n\n"
-            "[:octicons-arrow-right-24: Getting Started](getting-started.md)\n",
-            encoding="utf-8",
+        _fake_repo(
+            tmp_path,
+            monkeypatch,
+            {
+                # A target page with an H1 heading
+                "docs/getting-started.md": b"# Getting Started\n\nSome content.\n",
+                # docs/index.md with a matching nav card
+                "docs/index.md": (
+                    b"# Home\n\n"
+                    b"[:octicons-arrow-right-24: Getting Started](getting-started.md)\n"
+                ),
+            },
         )
 
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
-
         errors = validate_doc_nav_card_consistency()
         assert errors == []
 
     def test_mismatched_labels_reports_error(self, tmp_path, monkeypatch):
         """When a card label doesn't match the target H1, an error is reported."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        docs_dir = fake_root / "docs"
-        docs_dir.mkdir()
-
-        (docs_dir / "client.md").write_text(
-            "# Client API\n\nReference docs.\n",
-            encoding="utf-8",
+        _fake_repo(
+            tmp_path,
+            monkeypatch,
+            {
+                "docs/client.md": b"# Client API\n\nReference docs.\n",
+                "docs/index.md": (
+                    b"# Home\n\n[:octicons-arrow-right-24: Wrong Label](client.md)\n"
+                ),
+            },
         )
 
-        (docs_dir / "index.md").write_text(
-            "# Home\n\n"
-            "[:octicons-arrow-right-24: Wrong Label](client.md)\n",
-            encoding="utf-8",
-        )
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
-
         errors = validate_doc_nav_card_consistency()
         assert len(errors) == 1
         assert 'Card label "Wrong Label"' in errors[0]
@@ -1569,78 +1989,110 @@ class TestValidateDocNavCardConsistency:
 
     def test_missing_target_file_reports_error(self, tmp_path, monkeypatch):
         """When the target .md file doesn't exist, an error is reported without crashing."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        docs_dir = fake_root / "docs"
-        docs_dir.mkdir()
-
-        (docs_dir / "index.md").write_text(
-            "# Home\n\n"
-            "[:octicons-arrow-right-24: Nonexistent](nonexistent.md)\n",
-            encoding="utf-8",
+        _fake_repo(
+            tmp_path,
+            monkeypatch,
+            {
+                "docs/index.md": (
+                    b"# Home\n\n"
+                    b"[:octicons-arrow-right-24: Nonexistent](nonexistent.md)\n"
+                ),
+            },
         )
 
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
-
         errors = validate_doc_nav_card_consistency()
         assert len(errors) == 1
         assert "nonexistent.md" in errors[0]
 
     def test_external_url_cards_are_skipped(self, tmp_path, monkeypatch):
         """Cards pointing to external http:// URLs are silently skipped."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        docs_dir = fake_root / "docs"
-        docs_dir.mkdir()
-
         # The regex only matches links ending in .md, so an http URL ending
         # in .md would be the edge case to verify.  The function also has an
         # explicit startswith("http") guard.
-        (docs_dir / "index.md").write_text(
-            "# Home\n\n"
-            "[:octicons-arrow-right-24: docs.rs](https://docs.rs/signal-fish-client)\n",
-            encoding="utf-8",
+        _fake_repo(
+            tmp_path,
+            monkeypatch,
+            {
+                "docs/index.md": (
+                    b"# Home\n\n"
+                    b"[:octicons-arrow-right-24: docs.rs](https://docs.rs/signal-fish-client)\n"
+                ),
+            },
         )
 
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
-
         errors = validate_doc_nav_card_consistency()
         assert errors == []
 
     def test_missing_h1_heading_in_target(self, tmp_path, monkeypatch):
         """When the target file has no H1 heading, an error about the missing heading is reported."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        docs_dir = fake_root / "docs"
-        docs_dir.mkdir()
-
-        (docs_dir / "transport.md").write_text(
-            "Some content without a heading.\n",
-            encoding="utf-8",
+        _fake_repo(
+            tmp_path,
+            monkeypatch,
+            {
+                "docs/transport.md": b"Some content without a heading.\n",
+                "docs/index.md": (
+                    b"# Home\n\n[:octicons-arrow-right-24: Transport](transport.md)\n"
+                ),
+            },
         )
 
-        (docs_dir / "index.md").write_text(
-            "# Home\n\n"
-            "[:octicons-arrow-right-24: Transport](transport.md)\n",
-            encoding="utf-8",
+        errors = validate_doc_nav_card_consistency()
+        assert len(errors) == 1
+        assert "no H1 heading" in errors[0]
+        assert "transport.md" in errors[0]
+
+    def test_cards_sharing_a_line_are_matched_separately(self, tmp_path, monkeypatch):
+        """Two cards on one line are both checked, even with a space in a target."""
+        _fake_repo(
+            tmp_path,
+            monkeypatch,
+            {
+                "docs/my page.md": b"# Alpha\n",
+                "docs/a.md": b"# A\n",
+                "docs/index.md": (
+                    b"# Home\n\n"
+                    b"[:octicons-arrow-right-24: Alpha](my page.md) "
+                    b"[:octicons-arrow-right-24: Wrong](a.md)\n"
+                ),
+            },
         )
 
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        errors = validate_doc_nav_card_consistency()
+        assert len(errors) == 1
+        assert 'Card label "Wrong"' in errors[0]
+        assert "a.md" in errors[0]
+
+    def test_repeated_card_target_is_parsed_once(self, tmp_path, monkeypatch):
+        """A page linked by several cards has its H1 extracted only once."""
+        _fake_repo(
+            tmp_path,
+            monkeypatch,
+            {
+                "docs/client.md": b"# Client API\n",
+                "docs/index.md": (
+                    b"# Home\n\n"
+                    b"[:octicons-arrow-right-24: Client API](client.md)\n"
+                    b"[:octicons-arrow-right-24: Wrong Label](client.md)\n"
+                ),
+            },
+        )
+        parsed = []
+
+        def counting_extract_title(text):
+            parsed.append(text)
+            return extract_title(text)
+
+        monkeypatch.setattr(_mod, "extract_title", counting_extract_title)
 
         errors = validate_doc_nav_card_consistency()
+        assert len(parsed) == 1
         assert len(errors) == 1
-        assert "no H1 heading" in errors[0]
-        assert "transport.md" in errors[0]
+        assert 'Card label "Wrong Label"' in errors[0]
 
     def test_missing_docs_index_returns_empty(self, tmp_path, monkeypatch):
         """When docs/index.md doesn't exist, an empty list is returned."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        docs_dir = fake_root / "docs"
-        docs_dir.mkdir()
         # No index.md created
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        _fake_repo(tmp_path, monkeypatch, {})
 
         errors = validate_doc_nav_card_consistency()
         assert errors == []
@@ -1651,53 +2103,56 @@ class TestValidateDocNavCardConsistency:
 # ===================================================================
 
 
+# Changelog-style skill documents for the example-link tests, pre-encoded.
+_CHANGELOG_EXAMPLE_DOCS = {
+    "aligned": (
+        b"# Example\n\n"
+        b"## [Unreleased]\n\n"
+        b"## [0.2.0] - 2024-01-15\n\n"
+        b"[Unreleased]: https://github.com/example/project/compare/v0.2.0...HEAD\n"
+        b"[0.2.0]: https://github.com/example/project/releases/tag/v0.2.0\n"
+    ),
+    "stale-unreleased-compare": (
+        b"# Example\n\n"
+        b"[Unreleased]: https://github.com/example/project/compare/v0.1.0...HEAD\n"
+        b"[0.1.0]: https://github.com/example/project/releases/tag/v0.1.0\n"
+        b"[0.2.0]: https://github.com/example/project/releases/tag/v0.2.0\n"
+    ),
+    "wrong-latest-tag": (
+        b"# Example\n\n"
+        b"[Unreleased]: https://github.com/example/project/compare/v0.2.0...HEAD\n"
+        b"[0.2.0]: https://github.com/example/project/releases/tag/v0.1.0\n"
+    ),
+    "no-changelog-links": b"# Example\n\nNo changelog links here.\n",
+    "indented-links": (
+        b"   [Unreleased]: https://github.com/example/project/compare/v0.1.0...HEAD  \n"
+        b"   [0.2.0]: https://github.com/example/project/releases/tag/v0.2.0\n"
+    ),
+    "wrong-latest-tag-links-only": (
+        b"[Unreleased]: https://github.com/example/project/compare/v0.2.0...HEAD\n"
+        b"[0.2.0]: https://github.com/example/project/releases/tag/v0.1.0\n"
+    ),
+}
+
+
 class TestValidateChangelogExampleLinks:
     """Tests for changelog example reference link consistency validation."""
 
     def test_consistent_unreleased_and_latest_release_links_pass(
         self,
-        tmp_path,
-        monkeypatch,
+        inmem_skill_doc,
     ):
         """When links are aligned to latest version, no errors are returned."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        llm_dir = fake_root / ".llm"
-        llm_dir.mkdir()
-        doc = llm_dir / "skill.md"
-        doc.write_text(
-            "# Example\n\n"
-            "## [Unreleased]\n\n"
-            "## [0.2.0] - 2024-01-15\n\n"
-            "[Unreleased]: https://github.com/example/project/compare/v0.2.0...HEAD\n"
-            "[0.2.0]: https://github.com/example/project/releases/tag/v0.2.0\n",
-            encoding="utf-8",
-        )
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        doc = inmem_skill_doc(_CHANGELOG_EXAMPLE_DOCS["aligned"])
         errors = validate_changelog_example_links([doc])
         assert errors == [], f"Expected no errors but got: {errors}"
 
     def test_unreleased_compare_from_older_version_is_reported(
         self,
-        tmp_path,
-        monkeypatch,
+        inmem_skill_doc,
     ):
         """Unreleased compare must start from the latest linked version."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        llm_dir = fake_root / ".llm"
-        llm_dir.mkdir()
-        doc = llm_dir / "skill.md"
-        doc.write_text(
-            "# Example\n\n"
-            "[Unreleased]: https://github.com/example/project/compare/v0.1.0...HEAD\n"
-            "[0.1.0]: https://github.com/example/project/releases/tag/v0.1.0\n"
-            "[0.2.0]: https://github.com/example/project/releases/tag/v0.2.0\n",
-            encoding="utf-8",
-        )
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        doc = inmem_skill_doc(_CHANGELOG_EXAMPLE_DOCS["stale-unreleased-compare"])
         errors = validate_changelog_example_links([doc])
         assert len(errors) == 1, (
             f"Expected exactly 1 error but got {len(errors)}: {errors}"
@@ -1711,23 +2166,10 @@ class TestValidateChangelogExampleLinks:
 
     def test_latest_release_link_with_wrong_tag_is_reported(
         self,
-        tmp_path,
-        monkeypatch,
+        inmem_skill_doc,
     ):
         """Latest version link must point to its own tag."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        llm_dir = fake_root / ".llm"
-        llm_dir.mkdir()
-        doc = llm_dir / "skill.md"
-        doc.write_text(
-            "# Example\n\n"
-            "[Unreleased]: https://github.com/example/project/compare/v0.2.0...HEAD\n"
-            "[0.2.0]: https://github.com/example/project/releases/tag/v0.1.0\n",
-            encoding="utf-8",
-        )
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        doc = inmem_skill_doc(_CHANGELOG_EXAMPLE_DOCS["wrong-latest-tag"])
         errors = validate_changelog_example_links([doc])
         assert len(errors) == 1, (
             f"Expected exactly 1 error but got {len(errors)}: {errors}"
@@ -1736,45 +2178,18 @@ class TestValidateChangelogExampleLinks:
             f"Expected '[0.2.0] link points to v0.1.0' in error but got: {errors[0]!r}"
         )
 
-    def test_non_changelog_files_are_ignored(self, tmp_path, monkeypatch):
+    def test_non_changelog_files_are_ignored(self, inmem_skill_doc):
         """Files without an Unreleased link are ignored."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        llm_dir = fake_root / ".llm"
-        llm_dir.mkdir()
-        doc = llm_dir / "skill.md"
-        doc.write_text("# Example\n\nNo changelog links here.\n", encoding="utf-8")
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        doc = inmem_skill_doc(_CHANGELOG_EXAMPLE_DOCS["no-changelog-links"])
         errors = validate_changelog_example_links([doc])
         assert errors == [], f"Expected no errors but got: {errors}"
 
-    def test_relative_path_input_does_not_crash(self, tmp_path, monkeypatch):
-        """Validator handles relative path inputs without raising ValueError."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        llm_dir = fake_root / ".llm"
-        llm_dir.mkdir()
-        doc = llm_dir / "skill.md"
-        doc.write_text(
-            "[Unreleased]: https://github.com/example/project/compare/v0.2.0...HEAD\n"
-            "[0.2.0]: https://github.com/example/project/releases/tag/v0.1.0\n",
-            encoding="utf-8",
-        )
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
-        with monkeypatch.context() as mp:
-            mp.chdir(fake_root)
-            errors = validate_changelog_example_links([Path(".llm/skill.md")])
-        assert len(errors) == 1, (
-            f"Expected exactly 1 error but got {len(errors)}: {errors}"
-        )
-        # Use str(Path(...)) so the expected string uses the OS-native separator
-        # (forward slash on POSIX, backslash on Windows).
-        expected_path = str(Path(".llm/skill.md"))
-        assert expected_path in errors[0], (
-            f"Expected error to contain {expected_path!r} but got: {errors[0]!r}"
-        )
+    def test_indented_reference_links_are_checked(self, inmem_skill_doc):
+        """Reference links indented inside a list or fence are still parsed."""
+        doc = inmem_skill_doc(_CHANGELOG_EXAMPLE_DOCS["indented-links"])
+        errors = validate_changelog_example_links([doc])
+        assert len(errors) == 1, errors
+        assert "compares from v0.1.0" in errors[0]
 
     @pytest.mark.parametrize(
         "input_path_str",
@@ -1791,19 +2206,17 @@ class TestValidateChangelogExampleLinks:
         monkeypatch,
         input_path_str,
     ):
-        """Validator produces correct output regardless of path separator in input."""
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        llm_dir = fake_root / ".llm"
-        llm_dir.mkdir()
-        doc = llm_dir / "skill.md"
-        doc.write_text(
-            "[Unreleased]: https://github.com/example/project/compare/v0.2.0...HEAD\n"
-            "[0.2.0]: https://github.com/example/project/releases/tag/v0.1.0\n",
-            encoding="utf-8",
-        )
+        """Relative inputs in any separator style are read from disk and reported.
 
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        This is the on-disk end-to-end case: the validator resolves a
+        cwd-relative path without raising ValueError.
+        """
+        fake_root = _fake_repo(
+            tmp_path,
+            monkeypatch,
+            {".llm/skill.md": _CHANGELOG_EXAMPLE_DOCS["wrong-latest-tag-links-only"]},
+            docs_dir=False,
+        )
         with monkeypatch.context() as mp:
             mp.chdir(fake_root)
             errors = validate_changelog_example_links([Path(input_path_str)])
@@ -1876,40 +2289,18 @@ class TestValidateChangelogAddedApiEntries:
 class TestValidateUnstableFeatureWording:
     """Tests for stale release-specific unstable feature wording checks."""
 
-    def test_doc_auto_cfg_with_version_specific_wording_fails(
-        self,
-        tmp_path,
-        monkeypatch,
-    ):
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        llm_dir = fake_root / ".llm"
-        llm_dir.mkdir()
-        skill = llm_dir / "skill.md"
-        skill.write_text(
-            "# Skill\n\n"
-            "`doc_auto_cfg` was removed in Rust 1.92.\n",
-            encoding="utf-8",
+    def test_doc_auto_cfg_with_version_specific_wording_fails(self, inmem_skill_doc):
+        skill = inmem_skill_doc(
+            b"# Skill\n\n`doc_auto_cfg` was removed in Rust 1.92.\n"
         )
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
         errors = validate_unstable_feature_wording([skill])
         assert len(errors) == 1
         assert "removed in Rust" in errors[0]
 
-    def test_doc_auto_cfg_with_stable_wording_passes(self, tmp_path, monkeypatch):
-        fake_root = tmp_path / "repo"
-        fake_root.mkdir()
-        llm_dir = fake_root / ".llm"
-        llm_dir.mkdir()
-        skill = llm_dir / "skill.md"
-        skill.write_text(
-            "# Skill\n\n"
-            "`doc_auto_cfg` was removed from rustdoc.\n",
-            encoding="utf-8",
+    def test_doc_auto_cfg_with_stable_wording_passes(self, inmem_skill_doc):
+        skill = inmem_skill_doc(
+            b"# Skill\n\n`doc_auto_cfg` was removed from rustdoc.\n"
         )
-
-        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
         errors = validate_unstable_feature_wording([skill])
         assert errors == []
 
@@ -1997,6 +2388,67 @@ class TestWarnAbsoluteGuaranteeLanguage:
         warnings = warn_absolute_guarantee_language()
         assert warnings == []
 
+    def test_flags_delivery_term_before_guarantee_word(self, tmp_path, monkeypatch):
+        """Term order does not matter: 'sent' before 'always' is still flagged."""
+        fake_root = tmp_path / "repo"
+        src = fake_root / "src"
+        src.mkdir(parents=True)
+        (src / "lib.rs").write_text(
+            "//! Messages sent here are always acknowledged.\n",
+            encoding="utf-8",
+        )
+
+        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        warnings = warn_absolute_guarantee_language()
+        assert len(warnings) == 1
+
+    def test_scans_only_given_files(self, tmp_path, monkeypatch):
+        """An explicit file list (the staged files) limits the scan."""
+        fake_root = tmp_path / "repo"
+        src = fake_root / "src"
+        src.mkdir(parents=True)
+        staged = src / "staged.rs"
+        staged.write_text("/// The event is always delivered.\n", encoding="utf-8")
+        (src / "unstaged.rs").write_text(
+            "/// This event is never dropped.\n", encoding="utf-8"
+        )
+
+        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        warnings = warn_absolute_guarantee_language([staged, src / "deleted.rs"])
+        assert len(warnings) == 1
+        assert "staged.rs" in warnings[0]
+
+    def test_staged_rust_sources_lists_staged_src_files(self, tmp_path, monkeypatch):
+        """Only added or modified `src/**/*.rs` files in the index are listed."""
+        fake_root = tmp_path / "repo"
+        (fake_root / "src" / "nested").mkdir(parents=True)
+        (fake_root / "tests").mkdir()
+        staged = ["src/lib.rs", "src/nested/mod.rs", "src/notes.md", "tests/it.rs"]
+        for relative in (*staged, "src/unstaged.rs"):
+            (fake_root / relative).write_text("//! x\n", encoding="utf-8")
+        subprocess.run(["git", "init", "-q"], cwd=fake_root, check=True)
+        subprocess.run(["git", "add", *staged], cwd=fake_root, check=True)
+
+        monkeypatch.setattr(_mod, "REPO_ROOT", fake_root)
+        assert _mod.staged_rust_sources() == [
+            fake_root / "src" / "lib.rs",
+            fake_root / "src" / "nested" / "mod.rs",
+        ]
+
+    def test_staged_rust_sources_returns_none_when_git_fails(
+        self, tmp_path, monkeypatch
+    ):
+        """Outside a work tree, or without git, the caller falls back to a full scan."""
+        monkeypatch.setattr(_mod, "REPO_ROOT", tmp_path)
+        monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(tmp_path.parent))
+        assert _mod.staged_rust_sources() is None
+
+        def missing_git(*_args, **_kwargs):
+            raise FileNotFoundError("git")
+
+        monkeypatch.setattr(_mod.subprocess, "run", missing_git)
+        assert _mod.staged_rust_sources() is None
+
     def test_flags_unconditional_with_emit(self, tmp_path, monkeypatch):
         """'unconditional' with 'emit' triggers a warning."""
         fake_root = tmp_path / "repo"